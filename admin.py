@@ -0,0 +1,53 @@
+import hashlib
+import hmac
+import threading
+from functools import wraps
+
+from flask import abort, make_response, request
+from werkzeug.security import check_password_hash
+
+
+class AdminAuth:
+    """HTTP Basic auth for the admin pages: one username and a werkzeug password hash.
+
+    With no hash configured the admin pages do not exist (404). Password
+    hashes are slow on purpose, so credentials that passed once are
+    remembered by digest and later requests skip the hash.
+    """
+
+    def __init__(self, username, password_hash):
+        self.username = username
+        self.password_hash = password_hash
+        self.verified = set()
+        self.lock = threading.Lock()
+
+    def check(self, auth):
+        if auth is None or auth.type != "basic" or auth.username is None or auth.password is None:
+            return False
+        digest = hashlib.sha256(f"{auth.username}\0{auth.password}".encode()).digest()
+        if digest in self.verified:
+            return True
+        if not hmac.compare_digest(auth.username.encode(), self.username.encode()):
+            return False
+        if not check_password_hash(self.password_hash, auth.password):
+            return False
+        with self.lock:
+            self.verified.add(digest)
+        return True
+
+    def required(self, view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not self.password_hash:
+                abort(404)
+            if not self.check(request.authorization):
+                resp = make_response("Sign in to use the admin pages.\n", 401)
+                resp.mimetype = "text/plain"
+                resp.headers["WWW-Authenticate"] = 'Basic realm="Admin", charset="UTF-8"'
+            else:
+                resp = make_response(view(*args, **kwargs))
+            resp.headers["Cache-Control"] = "no-store"
+            resp.headers["X-Robots-Tag"] = "noindex"
+            return resp
+
+        return wrapper
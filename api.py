@@ -0,0 +1,203 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from flask import Response, request
+
+import compress
+from catalog import Certification
+
+try:
+    import msgpack
+except ImportError:  # MessagePack is optional; JSON is always served
+    msgpack = None
+
+FIELDS = Certification.__slots__ + ("url",)
+PER_PAGE = 20
+MAX_PER_PAGE = 100
+MIMETYPES = {"json": "application/json", "msgpack": "application/msgpack"}
+FORMATS = ("json", "msgpack") if msgpack else ("json",)
+# Bodies are compressed once per distinct response and memoized; brotli at
+# quality 11 would make every cold query far too expensive
+API_ENCODINGS = ("gzip",)
+CACHE_CONTROL = "public, max-age=60"
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _json(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class _Codec:
+    """Encode values, and join pre-encoded pieces into objects and arrays, in one format."""
+
+    def __init__(self, fmt):
+        self.fmt = fmt
+        if fmt == "msgpack":
+            self.packer = msgpack.Packer(use_bin_type=True)
+
+    def value(self, value):
+        return _json(value) if self.fmt == "json" else msgpack.packb(value, use_bin_type=True)
+
+    def key(self, name):
+        return _json(name) + b":" if self.fmt == "json" else msgpack.packb(name)
+
+    def obj(self, pairs):
+        """pairs: [(encoded key, encoded value)]."""
+        if self.fmt == "json":
+            return b"{" + b",".join(k + v for k, v in pairs) + b"}"
+        return self.packer.pack_map_header(len(pairs)) + b"".join(k + v for k, v in pairs)
+
+    def array(self, items):
+        if self.fmt == "json":
+            return b"[" + b",".join(items) + b"]"
+        return self.packer.pack_array_header(len(items)) + b"".join(items)
+
+
+class CatalogApi:
+    """Pre-serialized /api/v1 payloads for one catalog version.
+
+    Every field of every certification is encoded once, per format, when
+    the catalog loads. A response, whatever its fieldset, filter or page,
+    is then a byte join of those pieces; each distinct response is also
+    memoized with its gzip variant and ETag, so repeat traffic only looks
+    up bytes.
+    """
+
+    def __init__(self, catalog, cert_url, cache_size=512):
+        self.version = catalog.version
+        self.certs = catalog.certifications
+        self.order = list(catalog.certifications)
+        self.by_category = {cat.id: list(cat.certs) for cat in catalog.categories}
+        self.codecs = {fmt: _Codec(fmt) for fmt in FORMATS}
+        # fragments[fmt][slug][field] = encoded key + value
+        self.fragments = {}
+        for fmt, codec in self.codecs.items():
+            keys = {name: codec.key(name) for name in FIELDS}
+            self.fragments[fmt] = {
+                slug: {
+                    name: (keys[name], codec.value(value))
+                    for name, value in {**cert.as_dict(), "url": cert_url(slug)}.items()
+                }
+                for slug, cert in catalog.certifications.items()
+            }
+        self.full = {
+            fmt: {slug: self.codecs[fmt].obj(list(frags.values())) for slug, frags in by_slug.items()}
+            for fmt, by_slug in self.fragments.items()
+        }
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+
+    def encode(self, fmt, value):
+        return self.codecs[fmt].value(value)
+
+    def _record(self, fmt, slug, fields):
+        if fields is None:
+            return self.full[fmt][slug]
+        frags = self.fragments[fmt][slug]
+        return self.codecs[fmt].obj([frags[name] for name in fields])
+
+    def _envelope(self, fmt, data, meta):
+        codec = self.codecs[fmt]
+        return codec.obj([(codec.key("data"), data)] + [(codec.key(k), codec.value(v)) for k, v in meta.items()])
+
+    def detail(self, fmt, slug, fields):
+        if slug not in self.certs:
+            raise ApiError(404, f"No certification {slug!r}")
+        return self._envelope(fmt, self._record(fmt, slug, fields), {"version": self.version})
+
+    def listing(self, fmt, fields, category, page, per_page, page_url):
+        if category is None:
+            slugs = self.order
+        elif category in self.by_category:
+            slugs = self.by_category[category]
+        else:
+            raise ApiError(400, f"Unknown category {category!r}; use one of {', '.join(self.by_category)}")
+        pages = max(1, -(-len(slugs) // per_page))
+        if page > pages:
+            raise ApiError(404, f"Page {page} is past the last page ({pages})")
+        chunk = slugs[(page - 1) * per_page:page * per_page]
+        data = self.codecs[fmt].array([self._record(fmt, slug, fields) for slug in chunk])
+        meta = {
+            "version": self.version,
+            "page": page,
+            "per_page": per_page,
+            "pages": pages,
+            "total": len(slugs),
+            "next": page_url(page + 1) if page < pages else None,
+            "prev": page_url(page - 1) if page > 1 else None,
+        }
+        return self._envelope(fmt, data, meta)
+
+    def respond(self, key, build):
+        """Serve the response for key (an identity of the request), building it once."""
+        fmt = key[0]
+        encoding = compress.negotiate(request.accept_encodings, API_ENCODINGS)
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry is not None:
+                self.cache.move_to_end(key)
+        if entry is None:
+            try:
+                body = build()
+            except ApiError as exc:
+                return error_response(exc.status, exc.message, fmt)
+            digest = hashlib.sha256(body).hexdigest()[:24]
+            entry = (digest, {"identity": body})
+            with self.lock:
+                self.cache[key] = entry
+                while len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+        digest, bodies = entry
+        etag = f"{digest}-{encoding}"
+        if request.if_none_match.contains(etag):
+            resp = Response(status=304)
+        else:
+            body = bodies.get(encoding)
+            if body is None:
+                body = bodies[encoding] = compress.compress(bodies["identity"], encoding)
+            resp = Response(body, mimetype=MIMETYPES[fmt])
+            if encoding != "identity":
+                resp.headers["Content-Encoding"] = encoding
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = CACHE_CONTROL
+        resp.vary.update(("Accept", "Accept-Encoding"))
+        return resp
+
+
+def response_format():
+    fmt = request.args.get("format")
+    if fmt is None:
+        best = request.accept_mimetypes.best_match([MIMETYPES[f] for f in FORMATS], "application/json")
+        fmt = "msgpack" if best == MIMETYPES["msgpack"] else "json"
+    if fmt not in FORMATS:
+        raise ApiError(400, f"Unsupported format {fmt!r}; use one of {', '.join(FORMATS)}")
+    return fmt
+
+
+def requested_fields():
+    """?fields=title,levels -> ("slug", "title", "levels"); None means every field."""
+    raw = request.args.get("fields")
+    if not raw:
+        return None
+    names = [name.strip() for name in raw.split(",") if name.strip()]
+    unknown = [name for name in names if name not in FIELDS]
+    if unknown:
+        raise ApiError(400, f"Unknown fields: {', '.join(unknown)}")
+    # slug always comes first so records stay identifiable
+    return ("slug",) + tuple(dict.fromkeys(name for name in names if name != "slug"))
+
+
+def error_response(status, message, fmt="json"):
+    codec = _Codec(fmt) if fmt in FORMATS else _Codec("json")
+    resp = Response(codec.value({"error": message}), status=status, mimetype=MIMETYPES[codec.fmt])
+    resp.vary.add("Accept")
+    return resp
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import mimetypes
+import os
+import re
+
+from flask import request, send_file
+from werkzeug.security import safe_join
+
+import compress
+
+DIST = "dist"
+MANIFEST = "manifest.json"
+ASSET_TYPES = (".css", ".js", ".svg", ".jpg", ".jpeg", ".png", ".webp", ".gif", ".ico", ".woff2")
+# Already-compressed formats gain nothing from gzip/brotli
+COMPRESSIBLE = (".css", ".js", ".svg")
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# Rules for everything that can be above the fold on any page: base layout,
+# navbar, both hero variants and buttons
+CRITICAL_SELECTORS = re.compile(
+    # "*" on its own: \b never matches between "*" and what follows it
+    r"^(\*|(?::root|html|body|a|img|ul|\.container|\.navbar|\.nav-|\.dropdown|\.brand|\.hero|\.btn|\.cert-hero|\.page-nav)\b)"
+)
+
+
+def minify_css(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    css = css.replace(";}", "}")
+    return css.strip()
+
+
+def _blocks(css):
+    """Split minified CSS into top-level (prelude, body) pairs."""
+    out, depth, start, prelude = [], 0, 0, ""
+    for i, ch in enumerate(css):
+        if ch == "{":
+            if depth == 0:
+                prelude, start = css[start:i], i + 1
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                out.append((prelude, css[start:i]))
+                start = i + 1
+    return out
+
+
+def critical_css(css):
+    """Keep only rules whose selectors all match CRITICAL_SELECTORS (media queries included)."""
+    out = []
+    for prelude, body in _blocks(css):
+        if prelude.startswith("@media"):
+            inner = critical_css(body)
+            if inner:
+                out.append(f"{prelude}{{{inner}}}")
+        elif all(CRITICAL_SELECTORS.match(sel.strip()) for sel in prelude.split(",")):
+            out.append(f"{prelude}{{{body}}}")
+    return "".join(out)
+
+
+def build(static_dir):
+    """Write fingerprinted (and for text, minified + precompressed) copies under dist/.
+
+    Returns the manifest: {"files": {source: fingerprinted}, "critical_css": css text}.
+    """
+    dist = os.path.join(static_dir, DIST)
+    files = {}
+    critical = ""
+    for dirpath, dirs, names in os.walk(static_dir):
+        dirs[:] = sorted(d for d in dirs if os.path.join(dirpath, d) != dist)
+        for fname in sorted(names):
+            base, ext = os.path.splitext(fname)
+            if ext.lower() not in ASSET_TYPES:
+                continue
+            src = os.path.join(dirpath, fname)
+            rel = os.path.relpath(src, static_dir).replace(os.sep, "/")
+            with open(src, "rb") as f:
+                data = f.read()
+            if ext == ".css":
+                text = minify_css(data.decode("utf-8"))
+                data = text.encode("utf-8")
+                critical += critical_css(text)
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            out_rel = f"{DIST}/{os.path.dirname(rel) + '/' if os.path.dirname(rel) else ''}{base}.{digest}{ext}"
+            out_path = os.path.join(static_dir, out_rel)
+            os.makedirs(os.path.dirname(out_path), exist_ok=True)
+            if ext.lower() in COMPRESSIBLE:
+                for encoding, body in compress.variants(data).items():
+                    with open(out_path + compress.SUFFIXES.get(encoding, ""), "wb") as f:
+                        f.write(body)
+            else:
+                with open(out_path, "wb") as f:
+                    f.write(data)
+            files[rel] = out_rel
+
+    manifest = {"files": files, "critical_css": critical}
+    with open(os.path.join(dist, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def load_manifest(static_dir):
+    path = os.path.join(static_dir, DIST, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def install(app, inline_critical=False):
+    """Make url_for('static') emit fingerprinted URLs and serve them immutably.
+
+    Does nothing until `flask assets` has produced a manifest.
+    """
+    manifest = load_manifest(app.static_folder)
+    if manifest is None:
+        return None
+    files = manifest["files"]
+    prefix = f"{DIST}/"
+
+    @app.url_defaults
+    def fingerprinted_static(endpoint, values):
+        if endpoint == "static":
+            values["filename"] = files.get(values.get("filename"), values.get("filename"))
+
+    @app.before_request
+    def precompressed_static():
+        if request.endpoint != "static" or not request.view_args["filename"].startswith(prefix):
+            return None
+        path = safe_join(app.static_folder, request.view_args["filename"])
+        if path is None:
+            return None
+        available = [e for e in compress.ENCODINGS if os.path.exists(path + compress.SUFFIXES[e])]
+        encoding = compress.negotiate(request.accept_encodings, available)
+        if encoding == "identity":
+            return None
+        resp = send_file(path + compress.SUFFIXES[encoding], mimetype=mimetypes.guess_type(path)[0], etag=True)
+        resp.headers["Content-Encoding"] = encoding
+        resp.vary.add("Accept-Encoding")
+        return resp
+
+    @app.after_request
+    def immutable_static(resp):
+        if request.endpoint == "static" and request.view_args["filename"].startswith(prefix):
+            resp.headers["Cache-Control"] = IMMUTABLE
+            if request.view_args["filename"].endswith(COMPRESSIBLE):
+                resp.vary.add("Accept-Encoding")
+        return resp
+
+    @app.context_processor
+    def critical_css_context():
+        return {"critical_css": manifest["critical_css"] if inline_critical else ""}
+
+    return manifest
@@ -0,0 +1,204 @@
+import fcntl
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import date, datetime, time, timezone
+
+from flask import Response, request
+from markupsafe import escape
+
+from icons import ICONS
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:  # without Pillow only SVG badges are served
+    Image = None
+
+# Bump when the artwork changes so every badge gets a new address
+RENDER_VERSION = 1
+MIMETYPES = {"svg": "image/svg+xml", "png": "image/png"}
+FORMATS = ("svg", "png") if Image else ("svg",)
+IMMUTABLE = "public, max-age=31536000, immutable"
+WIDTH, HEIGHT = 320, 96
+PNG_SCALE = 2
+LEVEL_COLORS = {"Bronze": "#a0622d", "Silver": "#78858f", "Gold": "#b08a1e", "Platinum": "#4d6b78"}
+DEFAULT_COLOR = "#2e7d32"
+EXPIRED_COLOR = "#9e9e9e"
+FONTS = ("DejaVuSans.ttf", "DejaVuSans-Bold.ttf")
+
+
+def badge_inputs(listing, title):
+    """Everything a badge shows; equal inputs always render equal bytes."""
+    return {
+        "certificate_id": listing["certificate_id"],
+        "title": title,
+        "level": listing["level"],
+        "expires": listing["expires"],
+        "valid": listing["valid"],
+    }
+
+
+def badge_key(inputs, fmt):
+    blob = json.dumps([RENDER_VERSION, fmt, inputs], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()[:32]
+
+
+def _lines(inputs):
+    validity = f"Valid until {inputs['expires']}" if inputs["valid"] else f"Expired {inputs['expires']}"
+    color = LEVEL_COLORS.get(inputs["level"], DEFAULT_COLOR) if inputs["valid"] else EXPIRED_COLOR
+    return color, validity
+
+
+def render_svg(inputs):
+    color, validity = _lines(inputs)
+    title, level = inputs["title"], inputs["level"]
+    label = escape(f"{title}, {level} level, {validity.lower()}, certificate {inputs['certificate_id']}")
+    # Long titles are squeezed to the text column rather than overflowing it
+    fit = ' textLength="204" lengthAdjust="spacingAndGlyphs"' if len(title) * 8 > 204 else ""
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{HEIGHT}" viewBox="0 0 {WIDTH} {HEIGHT}"'
+        f' role="img" aria-label="{label}" font-family="DejaVu Sans,Verdana,Arial,sans-serif"><title>{label}</title>'
+        f'<rect x="1" y="1" width="{WIDTH - 2}" height="{HEIGHT - 2}" rx="10" fill="#fff" stroke="{color}" stroke-width="2"/>'
+        f'<path d="M11 1H92V95H11A10 10 0 0 1 1 85V11A10 10 0 0 1 11 1Z" fill="{color}"/>'
+        f'<path transform="translate(27 12) scale(1.6)" fill="#fff" d="{ICONS["leaf"]}"/>'
+        f'<text x="46" y="80" fill="#fff" font-size="12" font-weight="700" text-anchor="middle">{escape(level.upper())}</text>'
+        f'<text x="104" y="30" fill="#1b5e20" font-size="14" font-weight="700"{fit}>{escape(title)}</text>'
+        '<text x="104" y="50" fill="#333" font-size="11">Better Earth Workplace</text>'
+        f'<text x="104" y="70" fill="#555" font-size="11">{escape(validity)}</text>'
+        f'<text x="104" y="86" fill="#888" font-size="9">{escape(inputs["certificate_id"])}</text>'
+        "</svg>"
+    ).encode()
+
+
+def _font(bold, size):
+    try:
+        return ImageFont.truetype(FONTS[bold], size)
+    except OSError:
+        return ImageFont.load_default(size)
+
+
+def render_png(inputs):
+    """The SVG's layout drawn with Pillow at PNG_SCALE, for sites that cannot embed SVG."""
+    color, validity = _lines(inputs)
+    s = PNG_SCALE
+    im = Image.new("RGBA", (WIDTH * s, HEIGHT * s), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(im)
+    draw.rounded_rectangle((s, s, (WIDTH - 1) * s, (HEIGHT - 1) * s), radius=10 * s, fill="#fff", outline=color, width=2 * s)
+    draw.rounded_rectangle((s, s, 92 * s, (HEIGHT - 1) * s), radius=10 * s, fill=color, corners=(True, False, False, True))
+    draw.ellipse((30 * s, 14 * s, 62 * s, 46 * s), outline="#fff", width=3 * s)
+    draw.line([(38 * s, 30 * s), (44 * s, 37 * s), (55 * s, 23 * s)], fill="#fff", width=3 * s, joint="curve")
+    draw.text((46 * s, 80 * s), inputs["level"].upper(), fill="#fff", font=_font(True, 12 * s), anchor="ms")
+    size = 14
+    while size > 8 and _font(True, size * s).getlength(inputs["title"]) > 204 * s:
+        size -= 1
+    draw.text((104 * s, 30 * s), inputs["title"], fill="#1b5e20", font=_font(True, size * s), anchor="ls")
+    draw.text((104 * s, 50 * s), "Better Earth Workplace", fill="#333", font=_font(False, 11 * s), anchor="ls")
+    draw.text((104 * s, 70 * s), validity, fill="#555", font=_font(False, 11 * s), anchor="ls")
+    draw.text((104 * s, 86 * s), inputs["certificate_id"], fill="#888", font=_font(False, 9 * s), anchor="ls")
+    out = io.BytesIO()
+    im.save(out, "PNG", optimize=True)
+    return out.getvalue()
+
+
+RENDERERS = {"svg": render_svg, "png": render_png}
+
+
+class Badges:
+    """Certificate badges, stored by content address and rendered once per change.
+
+    A badge's address is a hash of what it shows (badge_key()), so a level
+    change or expiry makes a new badge and nothing ever needs invalidating.
+    Rendered bytes live on disk under the address, with the most recent in
+    memory. A missing badge is rendered single-flight: concurrent requests
+    in a process wait on one render, and a file lock per address stripe
+    keeps other worker processes from repeating it.
+    """
+
+    def __init__(self, cache_dir, max_age=86400, memory_size=1024):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.memory_size = memory_size
+        self.memory = OrderedDict()
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.renders = 0
+
+    def path(self, key, fmt):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.{fmt}")
+
+    def get(self, inputs, fmt):
+        """(key, bytes) of a badge, rendering it if no process has yet."""
+        key = badge_key(inputs, fmt)
+        with self.lock:
+            body = self.memory.get(key)
+            if body is not None:
+                self.memory.move_to_end(key)
+                return key, body
+            future = self.inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self.inflight[key] = Future()
+        if not leader:
+            return key, future.result()
+        try:
+            body = self._load_or_render(key, inputs, fmt)
+        except BaseException as exc:
+            with self.lock:
+                del self.inflight[key]
+            future.set_exception(exc)
+            raise
+        with self.lock:
+            self.memory[key] = body
+            while len(self.memory) > self.memory_size:
+                self.memory.popitem(last=False)
+            del self.inflight[key]
+        future.set_result(body)
+        return key, body
+
+    def _load_or_render(self, key, inputs, fmt):
+        path = self.path(key, fmt)
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            pass
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(os.path.join(self.cache_dir, key[:2], ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            # Another worker may have rendered it while this one waited
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    return f.read()
+            body = RENDERERS[fmt](inputs)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)
+        self.renders += 1
+        return body
+
+    def serve(self, listing, title, fmt):
+        inputs = badge_inputs(listing, title)
+        key = badge_key(inputs, fmt)
+        if request.if_none_match.contains(key):
+            # Revalidations, most of a busy embed's traffic, never load the badge
+            resp = Response(status=304)
+        else:
+            key, body = self.get(inputs, fmt)
+            resp = Response(body, mimetype=MIMETYPES[fmt])
+        resp.set_etag(key)
+        if request.args.get("v") == key:
+            resp.headers["Cache-Control"] = IMMUTABLE
+        else:
+            # The URL names a certificate, not a rendering: cache for a day,
+            # and never past the moment the badge would turn "Expired"
+            max_age = self.max_age
+            if listing["valid"]:
+                expires = datetime.combine(date.fromisoformat(listing["expires"]), time.max, timezone.utc)
+                max_age = max(0, min(max_age, int((expires - datetime.now(timezone.utc)).total_seconds())))
+            resp.headers["Cache-Control"] = f"public, max-age={max_age}"
+        return resp
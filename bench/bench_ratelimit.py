@@ -0,0 +1,81 @@
+"""Cost of the rate limiter per call, alone and on the page-route hot path.
+
+    python bench/bench_ratelimit.py [--calls 200000] [--requests 5000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ratelimit import MemoryBuckets, RateLimiter, SqliteBuckets  # noqa: E402
+
+
+def per_call(buckets, calls, keys=1000):
+    names = [f"10.0.{i // 256}.{i % 256}" for i in range(keys)]
+    start = time.perf_counter()
+    for i in range(calls):
+        buckets.take(names[i % keys])
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def threaded(buckets, calls, threads=8):
+    def work(offset):
+        for i in range(calls // threads):
+            buckets.take(f"k{(i + offset) % 1000}")
+
+    pool = [threading.Thread(target=work, args=(n * 7,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def route_cost(requests):
+    os.environ.setdefault("FLASK_RATELIMIT_ENABLED", "true")
+    import app as site
+
+    client = site.app.test_client()
+    view = site.app.view_functions["home"]
+    limited = RateLimiter().limit("1000000/second")(view)
+
+    def run(fn):
+        site.app.view_functions["home"] = fn
+        client.get("/")
+        start = time.perf_counter()
+        for _ in range(requests):
+            client.get("/")
+        return (time.perf_counter() - start) / requests * 1e6
+
+    # Interleave to even out noise
+    plain, with_limit = [], []
+    for _ in range(3):
+        plain.append(run(view))
+        with_limit.append(run(limited))
+    site.app.view_functions["home"] = view
+    return min(plain), min(with_limit)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"memory take(), 1 thread:   {per_call(MemoryBuckets(100, 100), args.calls):6.2f} us/call")
+    print(f"memory take(), 8 threads:  {threaded(MemoryBuckets(100, 100), args.calls):6.2f} us/call")
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite = SqliteBuckets(os.path.join(tmp, "rl.sqlite3"), "bench", 100, 100)
+        print(f"sqlite take(), 1 thread:   {per_call(sqlite, args.calls // 20):6.2f} us/call")
+    plain, limited = route_cost(args.requests)
+    print(f"GET / (page cache hit):    {plain:6.2f} us/request without limiter")
+    print(f"                           {limited:6.2f} us/request with limiter ({limited - plain:+.2f} us)")
+
+
+if __name__ == "__main__":
+    main()
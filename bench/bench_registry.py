@@ -0,0 +1,134 @@
+"""Registry latency at scale: name search, filters, keyset pages and verification.
+
+Seeds a throwaway registry (or uses --db), then times requests through the
+app, per kind, and checks p99 against the 10 ms target.
+
+    python bench/bench_registry.py [--listings 500000] [--requests 500] [--db PATH]
+"""
+import argparse
+import gc
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+from urllib.parse import quote_plus, urlencode
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+TARGET_MS = 10.0
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def seed(site, count):
+    started = time.perf_counter()
+    listings = site.registry.synthetic_listings(site.catalog_store.current, count)
+    for batch in iter(lambda: list(itertools.islice(listings, 10000)), []):
+        site.cert_registry.add(batch)
+    return time.perf_counter() - started
+
+
+def workloads(site, rng, n):
+    """{kind: [url]}: n requests of each kind, drawn from the seeded listings."""
+    conn = site.cert_registry.connection()
+    last = conn.execute("SELECT max(id) FROM listings").fetchone()[0]
+    sample = [
+        conn.execute("SELECT certificate_id, organization FROM listings WHERE id >= ? LIMIT 1", (i,)).fetchone()
+        for i in rng.sample(range(1, last + 1), n)
+    ]
+    catalog = site.catalog_store.current
+    certs = list(catalog.certifications.values())
+    industries = [ind.name for ind in catalog.industries]
+
+    def filters():
+        cert = rng.choice(certs)
+        chosen = {
+            "certification": cert.slug,
+            "level": rng.choice(cert.levels).name if cert.levels else None,
+            "industry": rng.choice(industries),
+        }
+        keep = rng.sample(sorted(chosen), rng.randint(1, 3))
+        return urlencode({k: v for k, v in chosen.items() if k in keep and v})
+
+    def typed(name):
+        # What someone types: a word or two, the last one unfinished
+        words = name.split()[:rng.randint(1, 3)]
+        words[-1] = words[-1][:max(2, rng.randint(2, len(words[-1])))]
+        return quote_plus(" ".join(words))
+
+    alphabet = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+    return {
+        "browse": ["/api/v1/registry"] * n,
+        "filter": [f"/api/v1/registry?{filters()}" for _ in range(n)],
+        "name search": [f"/api/v1/registry?q={typed(name)}" for _, name in sample],
+        "search + filter": [f"/api/v1/registry?q={typed(name)}&{filters()}" for _, name in sample],
+        "deep page": [f"/api/v1/registry?{filters()}&before={rng.randrange(1000, 400000)}" for _ in range(n)],
+        "registry page": [f"/registry?q={typed(name)}" for _, name in sample],
+        "verify hit": [f"/api/v1/verify/{cid}" for cid, _ in sample],
+        "verify miss": [f"/api/v1/verify/GB-2025-{''.join(rng.choices(alphabet, k=8))}" for _ in range(n)],
+        "verify page": [f"/verify/{cid}" for cid, _ in sample],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--listings", type=int, default=500000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--db", help="Use (and, when empty, seed) this registry database.")
+    args = parser.parse_args()
+
+    tmp = None
+    if args.db is None:
+        tmp = tempfile.TemporaryDirectory()
+        args.db = os.path.join(tmp.name, "registry.sqlite3")
+    os.environ["FLASK_REGISTRY_DB"] = args.db
+    # Measure the registry, not the limiter's buckets
+    os.environ.setdefault("FLASK_RATELIMIT_ENABLED", "false")
+    import app as site
+
+    have = site.cert_registry.connection().execute("SELECT count(*) FROM listings").fetchone()[0]
+    if have < args.listings:
+        print(f"seeding {args.listings - have} listings ...", flush=True)
+        print(f"  {seed(site, args.listings - have):.1f} s")
+    total = site.cert_registry.connection().execute("SELECT count(*) FROM listings").fetchone()[0]
+    started = time.perf_counter()
+    site.warm_up()
+    print(f"{total} listings; Bloom filter built in {(time.perf_counter() - started) * 1000:.0f} ms "
+          f"({site.cert_registry.bloom.size // 8 // 1024} KiB)")
+
+    # As serve.py does after preloading, so collections skip the catalog and indexes
+    gc.freeze()
+    client = site.app.test_client()
+    rng = random.Random(1)
+    failed = False
+    print(f"{'':18s} {'p50':>8s} {'p95':>8s} {'p99':>8s} {'max':>8s}  (ms, {args.requests} requests each)")
+    for kind, urls in workloads(site, rng, args.requests).items():
+        client.get(urls[0])
+        statements = []
+        site.cert_registry.connection().set_trace_callback(statements.append)
+        times = []
+        for url in urls:
+            start = time.perf_counter()
+            resp = client.get(url)
+            times.append((time.perf_counter() - start) * 1000)
+            assert resp.status_code in (200, 404), (url, resp.status_code)
+        site.cert_registry.connection().set_trace_callback(None)
+        p99 = percentile(times, 99)
+        failed |= p99 > TARGET_MS
+        note = f"  {len(statements)} SQL statements" if kind == "verify miss" else ""
+        print(f"{kind:18s} {percentile(times, 50):8.2f} {percentile(times, 95):8.2f} {p99:8.2f} "
+              f"{max(times):8.2f}{'  OVER' if p99 > TARGET_MS else ''}{note}")
+    if tmp is not None:
+        tmp.cleanup()
+    print(f"p99 target {TARGET_MS:.0f} ms: {'MISSED' if failed else 'met'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""Throughput, latency percentiles and response size of every page route.
+
+    python bench/bench_routes.py inproc [--iterations 300] [--no-page-cache]
+    python bench/bench_routes.py socket [--duration 10] [--concurrency 8] [--workers 2] [--threads 8]
+    python bench/bench_routes.py socket --url http://127.0.0.1:8000   # an already running server
+
+inproc drives the routes through Flask's test client, so it measures the
+app alone. socket starts serve.py on a free local port (or uses --url) and
+hammers it from several load processes, so it includes the HTTP server.
+
+Results are compared against bench/baselines/routes-<mode>.json when it
+exists; the run exits 1 if any route's p50/p95/p99 or bytes grew, or its
+throughput fell, by more than the thresholds. On a small box the load
+generator competes with the server for CPU, so compare socket runs only
+with the same --concurrency and --workers. --save writes the baseline.
+Baselines are machine-specific: record them on the box you compare on.
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+BASELINES = os.path.join(ROOT, "bench", "baselines")
+HEADERS = {"Accept-Encoding": "gzip, deflate, br", "Accept": "text/html"}
+
+
+def routes():
+    import catalog
+
+    slugs = sorted(catalog.load(os.path.join(ROOT, "data")).certifications)
+    return (
+        ["/", "/certifications"]
+        + [f"/certification/{slug}" for slug in slugs]
+        + ["/industries", "/contact", "/no-such-page"]
+    )
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def summarize(samples, elapsed):
+    """samples: {route: [(seconds, bytes), ...]} -> {route: stats}, plus an "ALL" row."""
+    out = {}
+    everything = []
+    for route, values in samples.items():
+        everything.extend(values)
+        out[route] = _stats(values, elapsed.get(route))
+    out["ALL"] = _stats(everything, elapsed.get("ALL"))
+    return out
+
+
+def _stats(values, elapsed):
+    latencies = sorted(v[0] for v in values)
+    total = sum(latencies)
+    return {
+        "requests": len(values),
+        "rps": round(len(values) / (elapsed if elapsed else total), 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "bytes": round(sum(v[1] for v in values) / len(values), 1),
+    }
+
+
+def run_inproc(args):
+    if args.no_page_cache:
+        os.environ["FLASK_PAGE_CACHE"] = "false"
+    os.environ.setdefault("FLASK_CATALOG_RELOAD_INTERVAL", "null")
+    from app import app
+
+    client = app.test_client()
+    samples = {}
+    for route in routes():
+        for _ in range(args.warmup):
+            client.get(route, headers=HEADERS)
+        values = samples[route] = []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            resp = client.get(route, headers=HEADERS)
+            body = resp.get_data()
+            values.append((time.perf_counter() - start, len(body)))
+            if resp.status_code >= 500:
+                sys.exit(f"{route} answered {resp.status_code}")
+    # Throughput of the test client is 1 / mean latency; elapsed=None does that
+    return summarize(samples, {})
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(args):
+    port = free_port()
+    env = dict(
+        os.environ,
+        FLASK_SERVE_BIND=f"127.0.0.1:{port}",
+        FLASK_SERVE_WORKERS=str(args.workers),
+        FLASK_SERVE_THREADS=str(args.threads),
+        FLASK_CATALOG_RELOAD_INTERVAL="null",
+    )
+    if args.no_page_cache:
+        env["FLASK_PAGE_CACHE"] = "false"
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "serve.py")], env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return proc, f"http://127.0.0.1:{port}"
+        except OSError:
+            if proc.poll() is not None:
+                sys.exit("serve.py exited during startup")
+            time.sleep(0.1)
+    proc.terminate()
+    sys.exit("serve.py did not start listening within 30s")
+
+
+def fetch(url, path):
+    """GET path on a new connection; returns (seconds, body bytes, status)."""
+    start = time.perf_counter()
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=30)
+    try:
+        conn.request("GET", path, headers=HEADERS)
+        resp = conn.getresponse()
+        body = resp.read()
+    finally:
+        conn.close()
+    return time.perf_counter() - start, len(body), resp.status
+
+
+def warm(base_url, paths, count, concurrency=4):
+    """Request every path count times, so each worker has rendered (and cached) each page."""
+    url = urllib.parse.urlsplit(base_url)
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(lambda path: fetch(url, path), paths * count))
+
+
+def load_process(base_url, paths, concurrency, duration, offset):
+    """One load-generating process: `concurrency` threads, one request per connection."""
+    url = urllib.parse.urlsplit(base_url)
+    samples = {path: [] for path in paths}
+    errors = []
+    stop_at = time.monotonic() + duration
+
+    def client(n):
+        i = n + offset
+        while time.monotonic() < stop_at:
+            path = paths[i % len(paths)]
+            i += 1
+            try:
+                elapsed, size, status = fetch(url, path)
+            except OSError as exc:
+                errors.append(f"{path}: {exc}")
+                continue
+            if status >= 500:
+                errors.append(f"{path}: HTTP {status}")
+            samples[path].append((elapsed, size))
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return samples, errors
+
+
+def run_socket(args):
+    proc = None
+    base_url = args.url
+    if base_url is None:
+        proc, base_url = start_server(args)
+    paths = routes()
+    try:
+        # A cold page costs a render plus brotli at quality 11 (tens of ms);
+        # measure the steady state, not which worker saw a page first
+        warm(base_url, paths, args.warmup)
+        procs = args.load_processes or max(1, min(os.cpu_count() or 1, args.concurrency // 8))
+        per_proc = max(1, args.concurrency // procs)
+        with multiprocessing.Pool(procs) as pool:
+            start = time.perf_counter()
+            results = pool.starmap(
+                load_process, [(base_url, paths, per_proc, args.duration, n * 7) for n in range(procs)]
+            )
+            elapsed = time.perf_counter() - start
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=60)
+
+    samples = {path: [] for path in paths}
+    errors = []
+    for proc_samples, proc_errors in results:
+        errors.extend(proc_errors)
+        for path, values in proc_samples.items():
+            samples[path].extend(values)
+    if errors:
+        print(f"{len(errors)} failed requests, e.g. {errors[0]}", file=sys.stderr)
+    # All routes share the run, so each route's throughput is its share of it
+    return summarize(samples, {path: elapsed for path in [*paths, "ALL"]})
+
+
+def compare(results, baseline, args):
+    """Print the table; return the list of regressions against baseline."""
+    regressions = []
+    print(f"{'route':<44} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'bytes':>8}  vs baseline")
+    for route, stats in results.items():
+        base = baseline.get(route)
+        notes = []
+        if base:
+            for key, threshold in (("p50_ms", args.latency_threshold), ("p95_ms", args.latency_threshold),
+                                   ("p99_ms", args.tail_threshold)):
+                if stats[key] > base[key] * (1 + threshold):
+                    notes.append(f"{key} +{(stats[key] / base[key] - 1) * 100:.0f}%")
+            if stats["rps"] < base["rps"] * (1 - args.throughput_threshold):
+                notes.append(f"req/s {(stats['rps'] / base['rps'] - 1) * 100:.0f}%")
+            if stats["bytes"] > base["bytes"] * (1 + args.bytes_threshold):
+                notes.append(f"bytes +{(stats['bytes'] / base['bytes'] - 1) * 100:.1f}%")
+        regressions.extend(f"{route}: {note}" for note in notes)
+        status = "REGRESSED " + ", ".join(notes) if notes else ("ok" if base else "-")
+        print(
+            f"{route:<44} {stats['rps']:>9.0f} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} "
+            f"{stats['p99_ms']:>8.2f} {stats['bytes']:>8.0f}  {status}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("mode", choices=("inproc", "socket"))
+    parser.add_argument("--iterations", type=int, default=300, help="inproc: requests per route")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per route")
+    parser.add_argument("--duration", type=float, default=10.0, help="socket: seconds of load")
+    parser.add_argument("--concurrency", type=int, default=8, help="socket: concurrent connections")
+    parser.add_argument("--load-processes", type=int, default=None, help="socket: load generator processes")
+    parser.add_argument("--workers", type=int, default=2, help="socket: serve.py workers")
+    parser.add_argument("--threads", type=int, default=8, help="socket: serve.py threads per worker")
+    parser.add_argument("--url", default=None, help="socket: benchmark this server instead of starting one")
+    parser.add_argument("--no-page-cache", action="store_true", help="render every request")
+    parser.add_argument("--baseline", default=None, help="baseline file (default bench/baselines/routes-<mode>.json)")
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--latency-threshold", type=float, default=0.25, help="allowed p50/p95 growth")
+    # A few hundred samples per route make p99 much noisier than p50/p95
+    parser.add_argument("--tail-threshold", type=float, default=1.0, help="allowed p99 growth")
+    parser.add_argument("--throughput-threshold", type=float, default=0.20, help="allowed req/s drop")
+    parser.add_argument("--bytes-threshold", type=float, default=0.02, help="allowed bytes/response growth")
+    args = parser.parse_args()
+
+    name = f"routes-{args.mode}{'-nocache' if args.no_page_cache else ''}.json"
+    baseline_path = args.baseline or os.path.join(BASELINES, name)
+    results = run_inproc(args) if args.mode == "inproc" else run_socket(args)
+
+    settings = {"iterations": args.iterations} if args.mode == "inproc" else {
+        "concurrency": args.concurrency, "workers": args.workers, "threads": args.threads,
+    }
+    baseline = {}
+    if os.path.exists(baseline_path) and not args.save:
+        with open(baseline_path) as f:
+            saved = json.load(f)
+        baseline = saved["routes"]
+        if saved.get("settings", settings) != settings:
+            print(f"Note: baseline was recorded with {saved['settings']}, this run uses {settings}\n")
+    regressions = compare(results, baseline, args)
+
+    if args.save:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump({"mode": args.mode, "settings": settings, "routes": results}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved baseline to {os.path.relpath(baseline_path, ROOT)}")
+    elif regressions:
+        print(f"\n{len(regressions)} regressions beyond thresholds", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Search index build time and query latency as the catalog grows.
+
+    python bench/bench_search.py [--sizes 14,1000,5000] [--queries 2000]
+
+Larger catalogs are synthesized by cloning the real certifications under new
+slugs with a few words swapped, so postings lists grow realistically.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import catalog  # noqa: E402
+from search import SearchIndex, tokenize  # noqa: E402
+
+QUERIES = [
+    "carbon", "carbon footprint", "water neutral", "esg rating", "brsr", "supply chain audit",
+    "packaging recycl", "hospitality", "renewable energy", "how long does certification take",
+    "site visit", "gree", "sustainable agri", "investor", "export markets",
+]
+
+
+def grow(base, size, rng):
+    certs = dict(base.certifications)
+    vocab = sorted({t for c in certs.values() for t in tokenize(c.short + " " + c.applicable)})
+    originals = list(base.certifications.values())
+    i = 0
+    while len(certs) < size:
+        src = originals[i % len(originals)]
+        i += 1
+        data = src.as_dict()
+        words = data["short"].split()
+        for _ in range(3):
+            words[rng.randrange(len(words))] = rng.choice(vocab)
+        data["short"] = " ".join(words)
+        data["title"] = f"{src.title} {i}"
+        slug = f"{src.slug}-{i}"
+        certs[slug] = catalog.build_certification(slug, data)
+    return catalog.Catalog(base.version, certs, (), ())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="14,1000,5000")
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    base = catalog.load(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data"))
+    print(f"{'docs':>6} {'terms':>6} {'postings':>9} {'build ms':>9} {'p50 us':>8} {'p99 us':>8} {'max us':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        cat = grow(base, size, rng)
+        start = time.perf_counter()
+        index = SearchIndex(cat)
+        build_ms = (time.perf_counter() - start) * 1000
+        timings = []
+        for n in range(args.queries):
+            query = QUERIES[n % len(QUERIES)]
+            start = time.perf_counter()
+            index.search(query)
+            timings.append((time.perf_counter() - start) * 1e6)
+        timings.sort()
+        print(
+            f"{len(index.docs):>6} {len(index.terms):>6} {len(index.doc_ids):>9} {build_ms:>9.1f} "
+            f"{statistics.median(timings):>8.1f} {timings[int(len(timings) * 0.99)]:>8.1f} {timings[-1]:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
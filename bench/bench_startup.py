@@ -0,0 +1,109 @@
+"""Cold-start time of a fresh process and of a preforked worker.
+
+    python bench/bench_startup.py [--runs 7] [--target-ms 150]
+
+Fresh process: imports, catalog load (with its indexes), the rest of the
+app setup and compiling every template, each with an empty and with a
+populated template bytecode cache. Preforked worker: time from fork() to
+accepting, as logged by serve.py across a start and two SIGHUP reloads.
+"""
+import argparse
+import json
+import os
+import re
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+CHILD = """
+import json, time
+started = time.perf_counter()
+import app
+imported = (time.perf_counter() - started) * 1000
+app.warm_up()
+boot = app.boot_times
+print(json.dumps({
+    "imports": imported - boot["app"],
+    "catalog": boot["catalog"],
+    "app setup": boot["app"] - boot["catalog"],
+    "templates": boot["templates"],
+    "total": imported + boot["templates"],
+}))
+"""
+READY = re.compile(r"worker \d+ ready in ([\d.]+) ms")
+
+
+def fresh_process(cache_dir):
+    env = dict(os.environ, FLASK_TEMPLATE_CACHE_DIR=cache_dir)
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def worker_ready_times(workers=2, reloads=2):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    env = dict(os.environ, FLASK_SERVE_BIND=f"127.0.0.1:{port}", FLASK_SERVE_WORKERS=str(workers))
+    with tempfile.TemporaryFile("w+") as log:
+        proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "serve.py")], env=env, stderr=log)
+        try:
+            expected = workers
+            for n in range(reloads + 1):
+                deadline = time.monotonic() + 30
+                while len(READY.findall(_read(log))) < expected and time.monotonic() < deadline:
+                    time.sleep(0.05)
+                if n < reloads:
+                    proc.send_signal(signal.SIGHUP)
+                    expected += workers
+        finally:
+            proc.terminate()
+            proc.wait(timeout=60)
+        return [float(ms) for ms in READY.findall(_read(log))]
+
+
+def _read(f):
+    f.seek(0)
+    return f.read()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--target-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    phases = ("imports", "catalog", "app setup", "templates", "total")
+    print(f"{'fresh process (median ms)':<28}" + "".join(f"{p:>11}" for p in phases))
+    for label, keep in (("empty bytecode cache", False), ("warm bytecode cache", True)):
+        runs = []
+        with tempfile.TemporaryDirectory() as cache_dir:
+            if keep:
+                fresh_process(cache_dir)
+            for _ in range(args.runs):
+                if not keep:
+                    for fname in os.listdir(cache_dir):
+                        os.unlink(os.path.join(cache_dir, fname))
+                runs.append(fresh_process(cache_dir))
+        print(f"{label:<28}" + "".join(f"{statistics.median(r[p] for r in runs):>11.1f}" for p in phases))
+
+    ready = worker_ready_times()
+    worst = max(ready)
+    verdict = "within" if worst <= args.target_ms else "OVER"
+    print(
+        f"\npreforked worker, fork to ready: median {statistics.median(ready):.1f} ms, "
+        f"max {worst:.1f} ms over {len(ready)} workers ({verdict} the {args.target_ms:.0f} ms target)"
+    )
+    if worst > args.target_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Cache purges against a stand-in cache server that records PURGE requests.
+
+    python bench/check_purge.py
+
+In process: a FAQ edit purges exactly cert:<slug>, search and api:list,
+and a title edit adds nav, registry and badges. Under serve.py: one edit to a copy of data/
+sends exactly one purge, from the master, after the workers that served
+the old catalog have exited. Exits 1 on any failure.
+"""
+import http.server
+import json
+import os
+import queue
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+SLUG = "water-neutral"
+HEADER = "Surrogate-Key"
+
+
+class StandInCache(http.server.ThreadingHTTPServer):
+    """Answers PURGE with 200 and queues (time, keys) of each request."""
+
+    def __init__(self):
+        self.purges = queue.Queue()
+        super().__init__(("127.0.0.1", 0), PurgeHandler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+    def received(self, timeout):
+        """Every purge within timeout seconds of the last one (or of the call)."""
+        got = []
+        while True:
+            try:
+                got.append(self.purges.get(timeout=timeout))
+            except queue.Empty:
+                return got
+
+
+class PurgeHandler(http.server.BaseHTTPRequestHandler):
+    def do_PURGE(self):
+        self.server.purges.put((time.monotonic(), set(self.headers.get(HEADER, "").split())))
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def edit(data_dir, **fields):
+    path = os.path.join(data_dir, "certifications", f"{SLUG}.json")
+    with open(path) as f:
+        data = json.load(f)
+    for name, change in fields.items():
+        data[name] = change(data[name])
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def faq_edit(faq):
+    return [dict(faq[0], a=faq[0]["a"] + " Updated.")] + faq[1:]
+
+
+def check(failures, label, ok, detail):
+    print(f"{'ok  ' if ok else 'FAIL'} {label}: {detail}")
+    if not ok:
+        failures.append(label)
+
+
+def in_process(failures, cache, data_dir):
+    os.environ["FLASK_CATALOG_DIR"] = data_dir
+    os.environ["FLASK_PURGE_URL"] = cache.url
+    import app as site
+
+    edit(data_dir, faq=faq_edit)
+    site.catalog_store.reload()
+    keys = set().union(*(k for _, k in cache.received(1.0)))
+    check(failures, "FAQ edit", keys == {f"cert:{SLUG}", "search", "api:list"}, " ".join(sorted(keys)))
+
+    edit(data_dir, title=lambda title: title.replace("Water", "Fresh Water"))
+    site.catalog_store.reload()
+    keys = set().union(*(k for _, k in cache.received(1.0)))
+    check(failures, "title edit", {f"cert:{SLUG}", "nav", "registry", "badges"} <= keys, " ".join(sorted(keys)))
+
+
+def get(url):
+    with urllib.request.urlopen(url, timeout=5) as resp:
+        return resp.read()
+
+
+def under_serve(failures, cache, data_dir):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    env = dict(
+        os.environ, FLASK_CATALOG_DIR=data_dir, FLASK_PURGE_URL=cache.url, FLASK_SERVE_BIND=f"127.0.0.1:{port}",
+        FLASK_SERVE_WORKERS="3", FLASK_CATALOG_RELOAD_INTERVAL="0.2", FLASK_METRICS_ENABLED="false",
+    )
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "serve.py")], cwd=ROOT, env=env,
+                            stderr=subprocess.PIPE, text=True)
+    log = []
+    threading.Thread(target=lambda: log.extend(proc.stderr), daemon=True).start()
+    try:
+        for _ in range(100):
+            try:
+                get(f"http://127.0.0.1:{port}/")
+                break
+            except OSError:
+                time.sleep(0.1)
+        edit(data_dir, faq=faq_edit)
+        # Let the workers notice the edit themselves too; they must not purge
+        deadline = time.monotonic() + 1.5
+        while time.monotonic() < deadline:
+            get(f"http://127.0.0.1:{port}/certification/{SLUG}")
+        purges = cache.received(3.0)
+        check(failures, "one purge per edit", len(purges) == 1, f"{len(purges)} purge requests")
+        if purges:
+            keys = purges[0][1]
+            check(failures, "served keys", keys == {f"cert:{SLUG}", "search", "api:list"}, " ".join(sorted(keys)))
+        body = get(f"http://127.0.0.1:{port}/certification/{SLUG}").decode()
+        check(failures, "new catalog served", "Updated." in body, "FAQ answer after the purge")
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(30)
+    rolled = any("rolling workers" in line for line in log)
+    check(failures, "workers rolled", rolled, "master replaced the workers before purging")
+    if failures:
+        print("".join(log[-30:]))
+
+
+def main():
+    failures = []
+    cache = StandInCache()
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = os.path.join(tmp, "data")
+        shutil.copytree(os.path.join(ROOT, "data"), data_dir)
+        in_process(failures, cache, data_dir)
+        shutil.rmtree(data_dir)
+        shutil.copytree(os.path.join(ROOT, "data"), data_dir)
+        under_serve(failures, cache, data_dir)
+    cache.shutdown()
+    print("all purge checks passed" if not failures else f"{len(failures)} failed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
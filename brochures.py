@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+
+from flask import Response, request, send_file
+
+from pools import RenderPool, run_all
+
+# Bump when the layout changes so every brochure gets a new address
+RENDER_VERSION = 1
+MIMETYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+IMMUTABLE = "public, max-age=31536000, immutable"
+GREEN = (0x1B, 0x5E, 0x20)
+TABLE_STYLE = "Light List Accent 3"
+
+
+def render_brochure(cert, contact_url, dest):
+    """Write the brochure for cert (a Certification.as_dict()) to dest; runs in a pool process.
+
+    The layout is the one `flask ingest` reads, so a brochure parses back
+    into the certification it was made from.
+    """
+    # Imported here, as in ingest.py: only the pool processes need python-docx
+    import docx
+    from docx.shared import Pt, RGBColor
+
+    doc = docx.Document()
+    doc.core_properties.title = cert["title"]
+    doc.core_properties.author = "Better Earth Workplace"
+    doc.styles["Normal"].font.size = Pt(10.5)
+    for name in ("Heading 1", "Heading 2", "Heading 3"):
+        doc.styles[name].font.color.rgb = RGBColor(*GREEN)
+    footer = f"Better Earth Workplace · {cert['title']}"
+    if contact_url:
+        footer += f" · Book a consultation: {contact_url}"
+    doc.sections[0].footer.paragraphs[0].add_run(footer).font.size = Pt(8)
+
+    # Anything before the first Heading 1 is ignored by ingest
+    doc.add_paragraph("Better Earth Workplace", style="Subtitle")
+    doc.add_heading(cert["title"], level=1)
+    doc.add_paragraph(cert["short"])
+
+    doc.add_heading("Who Can Apply", level=2)
+    doc.add_paragraph(cert["applicable"])
+    for item in cert["suitable_for"]:
+        doc.add_paragraph(item, style="List Bullet")
+    if cert["applicable_note"]:
+        doc.add_paragraph(cert["applicable_note"])
+
+    for heading, groups, note in (
+        ("Certification Criteria", cert["criteria"], cert["criteria_note"]),
+        ("Certification Benefits", cert["benefits"], ""),
+    ):
+        doc.add_heading(heading, level=2)
+        for group in groups:
+            doc.add_heading(group["title"], level=3)
+            for item in group["items"]:
+                doc.add_paragraph(item, style="List Bullet")
+        if note:
+            doc.add_paragraph(note)
+
+    doc.add_heading("Certification Process", level=2)
+    for step in cert["process"]:
+        para = doc.add_paragraph(style="List Number")
+        para.add_run(step["step"]).bold = True
+        para.add_run(f" – {step['desc']}" if step["desc"] else "")
+
+    if cert["levels"]:
+        doc.add_heading("Certification Levels", level=2)
+        columns = [("Level", "name"), ("Label", "label"), ("Score", "score"), ("Focus", "focus"), ("Description", "desc")]
+        if not any(level["score"] for level in cert["levels"]):
+            columns.remove(("Score", "score"))
+        table = doc.add_table(rows=1, cols=len(columns))
+        table.style = TABLE_STYLE
+        for cell, (header, _) in zip(table.rows[0].cells, columns):
+            cell.text = header
+        for level in cert["levels"]:
+            for cell, (_, field) in zip(table.add_row().cells, columns):
+                cell.text = level[field]
+
+    doc.add_heading("Frequently Asked Questions", level=2)
+    for item in cert["faq"]:
+        doc.add_heading(item["q"], level=3)
+        doc.add_paragraph(item["a"])
+
+    tmp = f"{dest}.{os.getpid()}.tmp"
+    doc.save(tmp)
+    os.replace(tmp, dest)
+    return dest
+
+
+class Brochures:
+    """Word brochures of each certification, rendered ahead of time in a process pool.
+
+    A brochure's file name is a hash of the certification's content, so it is
+    cached per slug and catalog version, and a reload that leaves a
+    certification alone keeps its file. The footer links to contact_url, a
+    fixed address from the configuration: nothing in a request changes a
+    brochure.
+
+    build_all renders what a catalog is missing before it is served. A
+    brochure still missing (a plain `flask run`, a failed render) is queued
+    once however many requests ask for it, and they get a 503 with
+    Retry-After instead of holding a request thread while it renders.
+    """
+
+    def __init__(self, cache_dir, contact_url=None, workers=1, max_age=3600):
+        self.cache_dir = cache_dir
+        self.contact_url = contact_url
+        self.workers = workers
+        self.max_age = max_age
+        self.pool = RenderPool(workers, "brochure")
+
+    def key(self, cert):
+        blob = json.dumps([RENDER_VERSION, self.contact_url, cert.as_dict()], sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(blob.encode()).hexdigest()[:24]
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.docx")
+
+    def submit(self, cert, key):
+        """Render the brochure in the background; one render per key however often it is asked for."""
+        dest = self.path(key)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        return self.pool.submit(dest, render_brochure, cert.as_dict(), self.contact_url, dest)
+
+    def build_all(self, catalog):
+        """Render every missing brochure of catalog and wait for them; returns how many were made."""
+        jobs = {}
+        for cert in catalog.certifications.values():
+            dest = self.path(self.key(cert))
+            if not os.path.exists(dest):
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                jobs[dest] = (cert.as_dict(), self.contact_url, dest)
+        return run_all(render_brochure, jobs, self.workers, "brochure")
+
+    def serve(self, cert):
+        key = self.key(cert)
+        path = self.path(key)
+        if not os.path.exists(path):
+            self.submit(cert, key)
+            resp = Response("The brochure is being prepared; please try again shortly.\n", status=503,
+                            mimetype="text/plain")
+            resp.headers["Retry-After"] = "5"
+            return resp
+        # send_file hands the open file to the server, which streams it in
+        # blocks (or with sendfile) instead of reading it into memory
+        resp = send_file(path, mimetype=MIMETYPE, as_attachment=True, download_name=f"{cert.slug}-brochure.docx",
+                         etag=key, conditional=True)
+        if request.args.get("v") == key:
+            resp.headers["Cache-Control"] = IMMUTABLE
+        else:
+            resp.headers["Cache-Control"] = f"public, max-age={self.max_age}"
+        return resp
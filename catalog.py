@@ -0,0 +1,243 @@
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from types import MappingProxyType
+
+log = logging.getLogger(__name__)
+
+
+class Record:
+    """Immutable, __slots__-based record; subclasses list their fields in __slots__."""
+
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    __delattr__ = __setattr__
+
+    def __repr__(self):
+        return f"{type(self).__name__}({getattr(self, self.__slots__[0])!r})"
+
+    def as_dict(self):
+        return {name: _plain(getattr(self, name)) for name in self.__slots__}
+
+
+def _plain(value):
+    if isinstance(value, Record):
+        return value.as_dict()
+    if isinstance(value, tuple):
+        return [_plain(v) for v in value]
+    return value
+
+
+class CriteriaGroup(Record):
+    # Also used for benefit groups, which have the same shape
+    __slots__ = ("title", "items")
+
+
+class ProcessStep(Record):
+    __slots__ = ("step", "desc")
+
+
+class Level(Record):
+    __slots__ = ("name", "label", "score", "focus", "desc")
+
+
+class Faq(Record):
+    __slots__ = ("q", "a")
+
+
+class Certification(Record):
+    __slots__ = (
+        "slug", "title", "category", "icon", "short", "applicable", "suitable_for",
+        "applicable_note", "criteria", "criteria_note", "process", "benefits", "levels", "faq",
+    )
+
+    @property
+    def short_title(self):
+        # "Carbon Neutral Certification" -> "Carbon Neutral", for menus
+        return self.title.removesuffix(" Certification")
+
+
+class Category(Record):
+    __slots__ = ("id", "title", "desc", "certs")
+
+    @property
+    def short_title(self):
+        return self.title.removesuffix(" Certifications")
+
+
+class Industry(Record):
+    __slots__ = ("name", "icon", "desc", "certs")
+
+
+def _freeze(value):
+    # Interning shares the many repeated strings (suitable_for entries, level
+    # names, criteria items) between certifications
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _record(cls, data, **extra):
+    fields = {name: _freeze(data[name]) for name in cls.__slots__ if name not in extra}
+    return cls(**fields, **extra)
+
+
+def build_certification(slug, data):
+    return _record(
+        Certification, data,
+        slug=sys.intern(slug),
+        criteria=tuple(_record(CriteriaGroup, g) for g in data["criteria"]),
+        process=tuple(_record(ProcessStep, s) for s in data["process"]),
+        benefits=tuple(_record(CriteriaGroup, g) for g in data["benefits"]),
+        levels=tuple(_record(Level, lv) for lv in data["levels"]),
+        faq=tuple(_record(Faq, f) for f in data["faq"]),
+    )
+
+
+class Catalog:
+    """One immutable snapshot of the catalog plus the indexes built from it."""
+
+    def __init__(self, version, certifications, categories, industries):
+        self.version = version
+        self.certifications = MappingProxyType(certifications)
+        self.categories = categories
+        self.industries = industries
+        self.by_category = MappingProxyType({
+            cat.id: tuple(certifications[slug] for slug in cat.certs) for cat in categories
+        })
+        self.by_industry = MappingProxyType({
+            ind.name: tuple(certifications[slug] for slug in ind.certs) for ind in industries
+        })
+        by_level = {}
+        for cert in certifications.values():
+            for level in cert.levels:
+                by_level.setdefault(level.name, []).append((cert, level))
+        self.by_level = MappingProxyType({name: tuple(v) for name, v in by_level.items()})
+        # Filled by CatalogStore from registered index builders
+        self.indexes = {}
+
+
+def _read_json(path):
+    with open(path, "rb") as f:
+        raw = f.read()
+    return raw, json.loads(raw)
+
+
+def load(root):
+    """Read a catalog directory into a Catalog; the version is a hash of the files."""
+    h = hashlib.sha256()
+    cert_dir = os.path.join(root, "certifications")
+    certifications = {}
+    for fname in sorted(os.listdir(cert_dir)):
+        if not fname.endswith(".json"):
+            continue
+        slug = fname[:-5]
+        raw, data = _read_json(os.path.join(cert_dir, fname))
+        h.update(fname.encode() + b"\0" + raw)
+        certifications[slug] = build_certification(slug, data)
+
+    raw, data = _read_json(os.path.join(root, "categories.json"))
+    h.update(raw)
+    categories = tuple(_record(Category, c) for c in data)
+    raw, data = _read_json(os.path.join(root, "industries.json"))
+    h.update(raw)
+    industries = tuple(_record(Industry, i) for i in data)
+
+    for owner in categories + industries:
+        missing = [slug for slug in owner.certs if slug not in certifications]
+        if missing:
+            raise ValueError(f"{owner!r} references unknown certifications: {', '.join(missing)}")
+    return Catalog(h.hexdigest(), certifications, categories, industries)
+
+
+def signature(root):
+    """Cheap change check: (path, mtime, size) of every catalog file."""
+    sig = []
+    for dirpath, dirs, files in os.walk(root):
+        dirs.sort()
+        for fname in sorted(files):
+            if fname.endswith(".json"):
+                st = os.stat(os.path.join(dirpath, fname))
+                sig.append((dirpath, fname, st.st_mtime_ns, st.st_size))
+    return tuple(sig)
+
+
+class CatalogStore:
+    """Holds the current Catalog and swaps in a new one when the files change.
+
+    Readers take `store.current` once per request and keep using that
+    snapshot; a reload builds the new Catalog and its indexes completely
+    before replacing the reference, so nobody observes a half-built state.
+    """
+
+    def __init__(self, root, check_interval=2.0):
+        self.root = root
+        self.check_interval = check_interval
+        self.builders = {}
+        self.listeners = []
+        self.lock = threading.Lock()
+        self._signature = signature(root)
+        self._checked = time.monotonic()
+        self.current = self._build(load(root))
+
+    def add_index(self, name, builder):
+        """Register builder(catalog) -> index; results land in catalog.indexes[name]."""
+        self.builders[name] = builder
+        self.current.indexes[name] = builder(self.current)
+
+    def on_reload(self, listener):
+        """Call listener(old, new) after a reload has been published."""
+        self.listeners.append(listener)
+        return listener
+
+    def _build(self, catalog):
+        for name, builder in self.builders.items():
+            catalog.indexes[name] = builder(catalog)
+        return catalog
+
+    def maybe_reload(self):
+        """Reload if the files changed; rate-limited to one stat walk per interval."""
+        now = time.monotonic()
+        if self.check_interval is None or now - self._checked < self.check_interval:
+            return False
+        self._checked = now
+        if signature(self.root) == self._signature:
+            return False
+        return self.reload()
+
+    def reload(self):
+        with self.lock:
+            sig = signature(self.root)
+            # Recorded even when the load fails: a bad file is retried once
+            # it changes again, not on every check until then
+            self._signature = sig
+            try:
+                catalog = load(self.root)
+                if catalog.version == self.current.version:
+                    return False
+                catalog = self._build(catalog)
+            except Exception:
+                # Keep serving the last good catalog, whatever is wrong with the new one
+                log.exception("catalog reload failed, keeping version %s", self.current.version[:12])
+                return False
+            old, self.current = self.current, catalog
+        log.info("catalog reloaded: %s -> %s", old.version[:12], self.current.version[:12])
+        for listener in self.listeners:
+            try:
+                listener(old, self.current)
+            except Exception:
+                log.exception("catalog reload listener %r failed", listener)
+        return True
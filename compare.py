@@ -0,0 +1,219 @@
+import difflib
+import threading
+from collections import OrderedDict
+
+MIN_CERTS = 2
+MAX_CERTS = 4
+# Row labels at least this similar (difflib ratio) share a row, so
+# "Environmental Compliance" lines up with "Environmental Score" and
+# "How long does certification take?" with "How long does the process take?"
+SIMILAR = 0.6
+
+# (name, heading, records of a cert, row label of a record, align by position)
+# Process steps are stages of one sequence: between matching steps, the nth
+# unmatched step of each cert share a row whatever they are called
+SECTIONS = (
+    ("criteria", "Criteria", lambda cert: cert.criteria, lambda group: group.title, False),
+    ("process", "Process", lambda cert: cert.process, lambda step: step.step, True),
+    ("benefits", "Benefits", lambda cert: cert.benefits, lambda group: group.title, False),
+    ("levels", "Levels", lambda cert: cert.levels, lambda level: level.name, False),
+    ("faq", "FAQ", lambda cert: cert.faq, lambda faq: faq.q, False),
+)
+
+
+def _norm(text):
+    return " ".join(text.lower().split())
+
+
+def _keys(labels):
+    """Row keys and display labels of one cert's labels, minus words every label has.
+
+    "Environmental Disclosures", "Social Disclosures", ... -> "environmental",
+    "social", ..., which then match another cert's "... Compliance" rows.
+    """
+    if len(labels) < 2:
+        return [_norm(label) for label in labels], list(labels)
+    shared = set.intersection(*(set(_norm(label).split()) for label in labels))
+    shown = [" ".join(w for w in label.split() if w.lower() not in shared) or label for label in labels]
+    return [_norm(label) for label in shown], shown
+
+
+class Row:
+    """One aligned row: the cells of every compared cert (None where it has none)."""
+
+    __slots__ = ("key", "label", "cells", "common")
+
+    def __init__(self, key, label, width):
+        self.key = key
+        self.label = label
+        self.cells = [None] * width
+        self.common = frozenset()
+
+    @property
+    def same(self):
+        first = self.cells[0]
+        return first is not None and all(
+            cell is not None and cell.as_dict() == first.as_dict() for cell in self.cells[1:]
+        )
+
+    def is_common(self, item):
+        return _norm(item) in self.common
+
+    def as_dict(self):
+        return {
+            "label": self.label,
+            "same": self.same,
+            "cells": [cell.as_dict() if cell is not None else None for cell in self.cells],
+            "common": sorted(self.common),
+        }
+
+
+def _similarity(a, b):
+    matcher = difflib.SequenceMatcher(None, a, b)
+    # quick_ratio() is an upper bound of ratio() and much cheaper
+    return matcher.ratio() if matcher.quick_ratio() >= SIMILAR else 0.0
+
+
+def _pair(old_keys, new_keys, positional):
+    """Monotone pairing of two runs of unequal keys -> [(i or None, j or None)].
+
+    Pairs maximize the summed similarity of pairs at least SIMILAR alike
+    (a small Needleman-Wunsch). With positional, the unpaired keys between
+    two pairs are then paired off in order as well.
+    """
+    n, m = len(old_keys), len(new_keys)
+    ratio = [[_similarity(a, b) for b in new_keys] for a in old_keys]
+    score = [[0.0] * (m + 1) for _ in range(n + 1)]
+    for i in range(n):
+        for j in range(m):
+            best = max(score[i][j + 1], score[i + 1][j])
+            if ratio[i][j] >= SIMILAR:
+                best = max(best, score[i][j] + ratio[i][j])
+            score[i + 1][j + 1] = best
+    out = []
+    i, j = n, m
+    while i or j:
+        if i and j and ratio[i - 1][j - 1] >= SIMILAR and score[i][j] == score[i - 1][j - 1] + ratio[i - 1][j - 1]:
+            out.append((i - 1, j - 1))
+            i, j = i - 1, j - 1
+        elif i and (not j or score[i][j] == score[i - 1][j]):
+            out.append((i - 1, None))
+            i -= 1
+        else:
+            out.append((None, j - 1))
+            j -= 1
+    out.reverse()
+    if not positional:
+        return out
+    paired, olds, news = [], [], []
+    for pair in out + [None]:
+        if pair is None or None not in pair:
+            for k in range(max(len(olds), len(news))):
+                paired.append((olds[k] if k < len(olds) else None, news[k] if k < len(news) else None))
+            olds, news = [], []
+            if pair is not None:
+                paired.append(pair)
+        elif pair[1] is None:
+            olds.append(pair[0])
+        else:
+            news.append(pair[1])
+    return paired
+
+
+def align(sequences, label, positional=False):
+    """Merge one list of records per cert into rows, keeping every cert's order."""
+    width = len(sequences)
+    rows = []
+    for col, records in enumerate(sequences):
+        keys, shown = _keys([label(record) for record in records])
+        matcher = difflib.SequenceMatcher(None, [row.key for row in rows], keys, autojunk=False)
+        merged = []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                for row, record in zip(rows[i1:i2], records[j1:j2]):
+                    row.cells[col] = record
+                merged.extend(rows[i1:i2])
+                continue
+            for i, j in _pair([row.key for row in rows[i1:i2]], keys[j1:j2], positional):
+                if i is None:
+                    row = Row(keys[j1 + j], shown[j1 + j], width)
+                else:
+                    row = rows[i1 + i]
+                if j is not None:
+                    row.cells[col] = records[j1 + j]
+                merged.append(row)
+        rows = merged
+    for row in rows:
+        if all(cell is not None and hasattr(cell, "items") for cell in row.cells):
+            row.common = frozenset.intersection(*(frozenset(map(_norm, cell.items)) for cell in row.cells))
+    return rows
+
+
+class Comparison:
+    def __init__(self, certs):
+        self.certs = certs
+        self.sections = [
+            (name, heading, align([records(cert) for cert in certs], label, positional))
+            for name, heading, records, label, positional in SECTIONS
+        ]
+        self.common_suitable = frozenset.intersection(
+            *(frozenset(map(_norm, cert.suitable_for)) for cert in certs)
+        )
+
+    def is_common_suitable(self, item):
+        return _norm(item) in self.common_suitable
+
+    def as_dict(self):
+        return {
+            "certifications": [
+                {"slug": c.slug, "title": c.title, "category": c.category, "short": c.short,
+                 "applicable": c.applicable, "suitable_for": list(c.suitable_for)}
+                for c in self.certs
+            ],
+            "common_suitable_for": sorted(self.common_suitable),
+            "sections": [
+                {"name": name, "title": heading, "rows": [row.as_dict() for row in rows]}
+                for name, heading, rows in self.sections
+            ],
+        }
+
+
+class Comparator:
+    """Memoized side-by-side comparisons for one catalog version.
+
+    Comparisons are keyed on the sorted slug set (and the catalog version),
+    so ?slugs=a,b and ?slugs=b,a share an entry; the LRU bounds memory.
+    """
+
+    def __init__(self, catalog, cache_size=256):
+        self.catalog = catalog
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+
+    def parse(self, values):
+        """?slugs= values (comma separated, possibly repeated) -> sorted slug tuple.
+
+        Raises ValueError for unknown slugs or more than MAX_CERTS.
+        """
+        slugs = sorted({s.strip() for value in values for s in value.split(",") if s.strip()})
+        unknown = [s for s in slugs if s not in self.catalog.certifications]
+        if unknown:
+            raise ValueError(f"Unknown certifications: {', '.join(unknown)}")
+        if len(slugs) > MAX_CERTS:
+            raise ValueError(f"Compare at most {MAX_CERTS} certifications")
+        return tuple(slugs)
+
+    def compare(self, slugs):
+        key = (self.catalog.version, tuple(sorted(slugs)))
+        with self.lock:
+            hit = self.cache.get(key)
+            if hit is not None:
+                self.cache.move_to_end(key)
+                return hit
+        comparison = Comparison([self.catalog.certifications[slug] for slug in key[1]])
+        with self.lock:
+            self.cache[key] = comparison
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return comparison
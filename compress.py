@@ -0,0 +1,41 @@
+import gzip
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+# Server preference order, best first
+ENCODINGS = ("br", "gzip") if brotli else ("gzip",)
+
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    if encoding == "gzip":
+        # mtime=0 keeps the output byte-for-byte reproducible between builds
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return data
+
+
+def decompress(data, encoding):
+    if encoding == "br":
+        return brotli.decompress(data)
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    return data
+
+
+def variants(data):
+    """Return {encoding: bytes} for identity and every supported encoding."""
+    out = {"identity": data}
+    for encoding in ENCODINGS:
+        out[encoding] = compress(data, encoding)
+    return out
+
+
+def negotiate(accept_encodings, available=ENCODINGS):
+    """Pick the best content-coding the client accepts out of `available`."""
+    return accept_encodings.best_match(available, "identity")
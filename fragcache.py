@@ -0,0 +1,65 @@
+import threading
+from collections import OrderedDict
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+
+class FragmentStore:
+    """Bounded LRU of rendered template fragments."""
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+
+class FragmentCacheExtension(Extension):
+    """{% cache key[, more, parts] %}...{% endcache %}
+
+    The body renders once per distinct key and is then served from the
+    store. The environment's fragment_cache_version() (the catalog version)
+    is appended to every key, so a catalog change renders fresh fragments
+    and old ones simply fall out of the LRU.
+    """
+
+    tags = {"cache"}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=FragmentStore(), fragment_cache_version=lambda: None)
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        parts = [parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            parts.append(parser.parse_expression())
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        # The template name keeps equal keys in different templates apart
+        parts.insert(0, nodes.Const(parser.name))
+        call = self.call_method("_render", [nodes.Tuple(parts, "load")])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render(self, parts, caller):
+        env = self.environment
+        key = parts + (env.fragment_cache_version(),)
+        value = env.fragment_cache.get(key)
+        if value is None:
+            value = Markup(caller())
+            env.fragment_cache.put(key, value)
+        return value
@@ -0,0 +1,105 @@
+import mimetypes
+import os
+
+from flask import Response, request, send_file, url_for
+from werkzeug.exceptions import NotFound
+
+import compress
+
+NOT_FOUND_FILE = "404.html"
+
+
+def page_paths(app, slugs):
+    """Every URL the site serves, as (path, file name inside the build dir)."""
+    with app.test_request_context():
+        urls = [url_for("home"), url_for("certifications"), url_for("industries"), url_for("contact")]
+        urls += [url_for("certification_detail", slug=slug) for slug in slugs]
+    return [(url, file_for(url)) for url in urls]
+
+
+def file_for(path):
+    path = path.strip("/")
+    return os.path.join(path, "index.html") if path else "index.html"
+
+
+def write_variants(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    for encoding, body in compress.variants(data).items():
+        with open(path + compress.SUFFIXES.get(encoding, ""), "wb") as f:
+            f.write(body)
+
+
+def build(app, out_dir, slugs):
+    """Render every page through the app and write it plus .gz/.br siblings."""
+    written = []
+    client = app.test_client()
+    pages = page_paths(app, slugs) + [("/__frozen_404__", NOT_FOUND_FILE)]
+    for url, name in pages:
+        resp = client.get(url, headers={"Accept-Encoding": "identity"})
+        expected = 404 if name == NOT_FOUND_FILE else 200
+        if resp.status_code != expected:
+            raise RuntimeError(f"{url} returned {resp.status_code}, expected {expected}")
+        write_variants(os.path.join(out_dir, name), resp.get_data())
+        written.append(name)
+    return written
+
+
+class FrozenSite:
+    """Pre-rendered pages loaded from a freeze build, keyed by file name."""
+
+    def __init__(self, root, in_memory=True):
+        self.root = root
+        self.in_memory = in_memory
+        self.pages = {}
+        for dirpath, _, files in os.walk(root):
+            for fname in files:
+                if not fname.endswith(".html"):
+                    continue
+                full = os.path.join(dirpath, fname)
+                self.pages[os.path.relpath(full, root)] = self._load(full)
+
+    def _load(self, full):
+        found = {"identity": full}
+        for encoding, suffix in compress.SUFFIXES.items():
+            if os.path.exists(full + suffix):
+                found[encoding] = full + suffix
+        if not self.in_memory:
+            return found
+        out = {}
+        for encoding, path in found.items():
+            with open(path, "rb") as f:
+                out[encoding] = f.read()
+        return out
+
+    def response(self, name, status=200):
+        page = self.pages.get(name)
+        if page is None:
+            return None
+        encoding = compress.negotiate(request.accept_encodings, [e for e in compress.ENCODINGS if e in page])
+        mimetype = mimetypes.guess_type(name)[0]
+        if self.in_memory:
+            resp = Response(page[encoding], status=status, mimetype=mimetype)
+        else:
+            resp = send_file(page[encoding], mimetype=mimetype, conditional=False)
+            resp.status_code = status
+        if encoding != "identity":
+            resp.headers["Content-Encoding"] = encoding
+        resp.vary.add("Accept-Encoding")
+        return resp
+
+
+def install(app, root, in_memory=True):
+    """Serve GET/HEAD page requests from a freeze build instead of rendering."""
+    site = FrozenSite(root, in_memory)
+
+    @app.before_request
+    def serve_frozen():
+        if request.method not in ("GET", "HEAD") or request.query_string:
+            return None
+        if isinstance(request.routing_exception, NotFound):
+            return site.response(NOT_FOUND_FILE, 404)
+        if request.endpoint == "static":
+            return None
+        return site.response(file_for(request.path))
+
+    return site
@@ -0,0 +1,115 @@
+import threading
+from html.parser import HTMLParser
+
+from flask import request
+
+import compress
+
+
+class CriticalResourceParser(HTMLParser):
+    """Collect what a page needs before first paint: head stylesheets and
+    blocking scripts, preloads, and images marked fetchpriority="high"."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []
+        self.in_head = False
+        self.webp = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "head":
+            self.in_head = True
+        elif tag == "link" and self.in_head:
+            rel = (attrs.get("rel") or "").lower().split()
+            if "stylesheet" in rel and attrs.get("href"):
+                self.add(attrs["href"], "style")
+            elif "preload" in rel and attrs.get("href") and attrs.get("as"):
+                self.add(attrs["href"], attrs["as"])
+        elif tag == "script" and self.in_head:
+            if attrs.get("src") and not {"async", "defer"} & attrs.keys() and attrs.get("type") != "module":
+                self.add(attrs["src"], "script")
+        elif tag == "source" and attrs.get("type") == "image/webp":
+            self.webp = attrs
+        elif tag == "img" and attrs.get("fetchpriority") == "high" and attrs.get("src"):
+            # Inside <picture>, preload the WebP candidates the browser will pick
+            source = self.webp or attrs
+            extra = {}
+            if source.get("srcset"):
+                extra["imagesrcset"] = source["srcset"]
+                if source.get("sizes"):
+                    extra["imagesizes"] = source["sizes"]
+            if self.webp:
+                extra["type"] = "image/webp"
+            self.add(attrs["src"], "image", **extra)
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self.in_head = False
+        elif tag == "picture":
+            self.webp = None
+
+    def add(self, href, kind, **extra):
+        # Only same-origin paths: a preload of a third-party URL costs a
+        # connection the page may not need yet
+        if not href.startswith("/") or href.startswith("//"):
+            return
+        params = "".join(f'; {name}="{value.replace(chr(34), "%22")}"' for name, value in extra.items())
+        link = f"<{href}>; rel=preload; as={kind}{params}"
+        if link not in self.links:
+            self.links.append(link)
+
+
+def critical_links(html):
+    parser = CriticalResourceParser()
+    parser.feed(html)
+    parser.close()
+    return parser.links
+
+
+class EarlyHints:
+    """Per-endpoint preload Link headers, learned from the first rendered page.
+
+    The first successful HTML response of an endpoint is scanned for its
+    critical sub-resources. From then on every response of that endpoint
+    carries them as Link: rel=preload, and servers that expose
+    environ["wsgi.early_hints"] (serve.py) send them in a 103 Early Hints
+    response before the view runs. Call reset() when what pages reference
+    may have changed, e.g. after a catalog reload.
+    """
+
+    def __init__(self):
+        self.links = {}
+        self.lock = threading.Lock()
+
+    def reset(self):
+        with self.lock:
+            self.links = {}
+
+    def learn(self, endpoint, resp):
+        body = compress.decompress(resp.get_data(), resp.headers.get("Content-Encoding", "identity"))
+        value = ", ".join(critical_links(body.decode("utf-8", "replace")))
+        with self.lock:
+            self.links[endpoint] = value
+
+    def install(self, app):
+        @app.before_request
+        def send_early_hints():
+            if request.method != "GET":
+                return
+            value = self.links.get(request.endpoint)
+            send = request.environ.get("wsgi.early_hints")
+            if value and send is not None:
+                send([("Link", value)])
+
+        @app.after_request
+        def preload_links(resp):
+            endpoint = request.endpoint
+            if endpoint is None or resp.mimetype != "text/html" or request.method != "GET":
+                return resp
+            if resp.status_code == 200 and endpoint not in self.links and not resp.is_streamed:
+                self.learn(endpoint, resp)
+            value = self.links.get(endpoint)
+            if value and resp.status_code == 200:
+                resp.headers.add("Link", value)
+            return resp
@@ -0,0 +1,62 @@
+import hashlib
+
+from markupsafe import Markup, escape
+
+import compress
+
+# 24x24 path data for every icon name a certification or industry may use
+ICONS = {
+    "leaf": "M17 8C8 10 5.9 16.17 3.82 21.34l1.89.66C7.72 17.84 9.64 12 17 10V14l7-7-7-7v4z",
+    "globe": "M12 2C6.48 2 2 6.48 2 12s4.48 10 10 10 10-4.48 10-10S17.52 2 12 2zm-1 17.93c-3.95-.49-7-3.85-7-7.93 0-.62.08-1.21.21-1.79L9 15v1c0 1.1.9 2 2 2v1.93z",
+    "droplet": "M12 2c-5.33 4.55-8 8.48-8 11.8 0 4.98 3.8 8.2 8 8.2s8-3.22 8-8.2c0-3.32-2.67-7.25-8-11.8z",
+    "shield-check": "M12 1L3 5v6c0 5.55 3.84 10.74 9 12 5.16-1.26 9-6.45 9-12V5l-9-4zm-2 16l-4-4 1.41-1.41L10 14.17l6.59-6.59L18 9l-8 8z",
+    "bar-chart": "M5 9.2h3V19H5zM10.6 5h2.8v14h-2.8zm5.6 8H19v6h-2.8z",
+    "file-text": "M14 2H6c-1.1 0-2 .9-2 2v16c0 1.1.9 2 2 2h12c1.1 0 2-.9 2-2V8l-6-6zm2 16H8v-2h8v2zm0-4H8v-2h8v2zm-3-5V3.5L18.5 9H13z",
+    "heart": "M12 21.35l-1.45-1.32C5.4 15.36 2 12.28 2 8.5 2 5.42 4.42 3 7.5 3c1.74 0 3.41.81 4.5 2.09C13.09 3.81 14.76 3 16.5 3 19.58 3 22 5.42 22 8.5c0 3.78-3.4 6.86-8.55 11.54L12 21.35z",
+    "factory": "M22 10V6a2 2 0 00-2-2H4a2 2 0 00-2 2v4l2 6h16l2-6zM8 18h8v2H8z",
+    "link": "M3.9 12c0-1.71 1.39-3.1 3.1-3.1h4V7H7c-2.76 0-5 2.24-5 5s2.24 5 5 5h4v-1.9H7c-1.71 0-3.1-1.39-3.1-3.1zM8 13h8v-2H8v2zm9-6h-4v1.9h4c1.71 0 3.1 1.39 3.1 3.1s-1.39 3.1-3.1 3.1h-4V17h4c2.76 0 5-2.24 5-5s-2.24-5-5-5z",
+    "building": "M15 11V5l-3-3-3 3v2H3v14h18V11h-6zm-8 8H5v-2h2v2zm0-4H5v-2h2v2zm0-4H5V9h2v2zm6 8h-2v-2h2v2zm0-4h-2v-2h2v2zm0-4h-2V9h2v2zm0-4h-2V5h2v2zm6 12h-2v-2h2v2zm0-4h-2v-2h2v2z",
+    "hotel": "M7 13c1.66 0 3-1.34 3-3S8.66 7 7 7s-3 1.34-3 3 1.34 3 3 3zm12-6h-8v7H3V5H1v15h2v-3h18v3h2v-9c0-2.21-1.79-4-4-4z",
+    "wheat": "M12.5 6.9c1.78 0 3.24-1.32 3.48-3.03C14.46 2.64 12.54 2 12.5 2s-1.96.64-3.48 1.87C9.26 5.58 10.72 6.9 12.5 6.9zM12.5 8c-1.78 0-3.5.94-3.5 3 0 1.52.89 2.82 2.17 3.43-.06.26-.17.52-.17.57 0 2 1.5 5 1.5 5s1.5-3 1.5-5c0-.05-.11-.31-.17-.57A3.494 3.494 0 0016 11c0-2.06-1.72-3-3.5-3z",
+    "package": "M20 2H4c-1.1 0-2 .9-2 2v16c0 1.1.9 2 2 2h16c1.1 0 2-.9 2-2V4c0-1.1-.9-2-2-2zm-8 18c-3.31 0-6-2.69-6-6s2.69-6 6-6 6 2.69 6 6-2.69 6-6 6z",
+    "box": "M20 2H4c-1 0-2 .9-2 2v3.01c0 .72.43 1.34 1 1.69V20c0 1.1 1.1 2 2 2h14c.9 0 2-.9 2-2V8.7c.57-.35 1-.97 1-1.69V4c0-1.1-1-2-2-2zm-5 12H9v-2h6v2zm5-7H4V4h16v3z",
+    "truck": "M20 8h-3V4H3c-1.1 0-2 .9-2 2v11h2c0 1.66 1.34 3 3 3s3-1.34 3-3h6c0 1.66 1.34 3 3 3s3-1.34 3-3h2v-5l-3-4zM6 18.5c-.83 0-1.5-.67-1.5-1.5s.67-1.5 1.5-1.5 1.5.67 1.5 1.5-.67 1.5-1.5 1.5zm13.5-9l1.96 2.5H17V9.5h2.5zm-1.5 9c-.83 0-1.5-.67-1.5-1.5s.67-1.5 1.5-1.5 1.5.67 1.5 1.5-.67 1.5-1.5 1.5z",
+    "briefcase": "M20 6h-4V4c0-1.11-.89-2-2-2h-4c-1.11 0-2 .89-2 2v2H4c-1.11 0-1.99.89-1.99 2L2 19c0 1.11.89 2 2 2h16c1.11 0 2-.89 2-2V8c0-1.11-.89-2-2-2zm-6 0h-4V4h4v2z",
+}
+# Drawn for icon names the registry does not know
+FALLBACK = "M12 2a10 10 0 100 20 10 10 0 000-20z"
+
+
+def icon_names(catalog):
+    names = {cert.icon for cert in catalog.certifications.values()}
+    names.update(ind.icon for ind in catalog.industries)
+    return sorted(names)
+
+
+class Sprite:
+    """One SVG sprite with a <symbol> per icon the catalog uses.
+
+    Built once per catalog version; pages reference symbols with
+    <use href="/icons.svg?v=...#i-name">, so every card costs one short tag
+    however many icons exist, and the sprite itself is cached forever.
+    """
+
+    def __init__(self, catalog):
+        self.names = frozenset(n for n in icon_names(catalog) if n in ICONS)
+        symbols = "".join(
+            f'<symbol id="i-{name}" viewBox="0 0 24 24"><path d="{ICONS[name]}"/></symbol>'
+            for name in sorted(self.names)
+        )
+        symbols += f'<symbol id="i-fallback" viewBox="0 0 24 24"><path d="{FALLBACK}"/></symbol>'
+        self.svg = f'<svg xmlns="http://www.w3.org/2000/svg">{symbols}</svg>'.encode()
+        self.version = hashlib.sha256(self.svg).hexdigest()[:16]
+        self.variants = compress.variants(self.svg)
+
+    def symbol(self, name):
+        return f"i-{name}" if name in self.names else "i-fallback"
+
+    def use(self, href, name, size=24):
+        return Markup(
+            f'<svg viewBox="0 0 24 24" width="{size}" height="{size}" fill="currentColor" aria-hidden="true">'
+            f'<use href="{escape(href)}#{self.symbol(name)}"/></svg>'
+        )
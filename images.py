@@ -0,0 +1,143 @@
+import hashlib
+import os
+
+from flask import redirect, send_file, url_for
+from markupsafe import Markup, escape
+from werkzeug.security import safe_join
+
+from pools import RenderPool, run_all
+
+try:
+    from PIL import Image
+except ImportError:  # without Pillow the helper emits plain <img> tags
+    Image = None
+
+WIDTHS = (480, 768, 1200)
+SOURCE_TYPES = (".jpg", ".jpeg", ".png")
+FORMATS = {"webp": "WEBP", "jpeg": "JPEG"}
+MIMETYPES = {"webp": "image/webp", "jpeg": "image/jpeg"}
+QUALITY = 78
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def render_variant(src, dest, width, fmt, quality=QUALITY):
+    """Resize src to width and encode as fmt; runs in a pool process."""
+    with Image.open(src) as im:
+        im = im.convert("RGB")
+        if im.width > width:
+            im = im.resize((width, round(im.height * width / im.width)), Image.LANCZOS)
+        tmp = f"{dest}.{os.getpid()}.tmp"
+        im.save(tmp, FORMATS[fmt], quality=quality, optimize=True)
+    os.replace(tmp, dest)
+    return dest
+
+
+class ImagePipeline:
+    """WebP/JPEG variants at several widths, stored by content address.
+
+    A variant's file name is a hash of the source bytes, width, format and
+    quality, so a changed image never collides with an old variant and the
+    URLs can be cached forever. Missing variants are rendered in a process
+    pool; until one is ready the request is redirected to the original, so
+    nothing ever waits on an encoder.
+    """
+
+    def __init__(self, static_dir, cache_dir, widths=WIDTHS, workers=2):
+        self.static_dir = static_dir
+        self.cache_dir = cache_dir
+        self.widths = widths
+        self.workers = workers
+        self.sources = {}
+        self.pool = RenderPool(workers, "image variant")
+
+    def source(self, filename):
+        """(digest, width) of a static image, recomputed only when its mtime changes."""
+        path = os.path.join(self.static_dir, filename)
+        mtime = os.stat(path).st_mtime_ns
+        cached = self.sources.get(filename)
+        if cached is None or cached[0] != mtime:
+            with open(path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()[:16]
+            with Image.open(path) as im:
+                cached = self.sources[filename] = (mtime, digest, im.width)
+        return cached[1], cached[2]
+
+    def variant_path(self, digest, width, fmt):
+        key = hashlib.sha256(f"{digest}:{width}:{fmt}:{QUALITY}".encode()).hexdigest()[:24]
+        return os.path.join(self.cache_dir, key[:2], f"{key}.{fmt}")
+
+    def widths_for(self, source_width):
+        return [w for w in self.widths if w < source_width] + [source_width]
+
+    def submit(self, filename, width, fmt, dest):
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        self.pool.submit(dest, render_variant, os.path.join(self.static_dir, filename), dest, width, fmt)
+
+    def build_all(self):
+        """Render every missing variant of every static image; returns how many were made."""
+        jobs = {}
+        for dirpath, dirs, files in os.walk(self.static_dir):
+            dirs[:] = [d for d in dirs if d != "dist"]
+            for fname in files:
+                if not fname.lower().endswith(SOURCE_TYPES):
+                    continue
+                filename = os.path.relpath(os.path.join(dirpath, fname), self.static_dir).replace(os.sep, "/")
+                digest, source_width = self.source(filename)
+                for width in self.widths_for(source_width):
+                    for fmt in FORMATS:
+                        dest = self.variant_path(digest, width, fmt)
+                        if not os.path.exists(dest):
+                            os.makedirs(os.path.dirname(dest), exist_ok=True)
+                            jobs[dest] = (os.path.join(self.static_dir, filename), dest, width, fmt)
+        return run_all(render_variant, jobs, self.workers, "image variant")
+
+    def serve(self, filename, width, fmt, version):
+        """Response for one variant URL, or None if it names no valid variant."""
+        path = safe_join(self.static_dir, filename)
+        if fmt not in FORMATS or not filename.lower().endswith(SOURCE_TYPES) or path is None:
+            return None
+        if not os.path.isfile(path):
+            return None
+        if Image is None:
+            return redirect(url_for("static", filename=filename), code=302)
+        digest, source_width = self.source(filename)
+        if width not in self.widths_for(source_width):
+            return None
+        dest = self.variant_path(digest, width, fmt)
+        if os.path.exists(dest) and version == digest:
+            resp = send_file(dest, mimetype=MIMETYPES[fmt], conditional=True, etag=True)
+            resp.headers["Cache-Control"] = IMMUTABLE
+            return resp
+        if not os.path.exists(dest):
+            self.submit(filename, width, fmt, dest)
+        # Not rendered yet (or a stale version): hand out the original, uncached
+        resp = redirect(url_for("static", filename=filename), code=302)
+        resp.headers["Cache-Control"] = "no-store"
+        return resp
+
+    def picture(self, filename, alt, sizes="100vw", lazy=True, **attrs):
+        """<picture> with WebP and JPEG srcsets; lazy-loaded unless lazy=False."""
+        src = url_for("static", filename=filename)
+        attrs = {"alt": alt, **attrs}
+        if lazy:
+            attrs["loading"] = "lazy"
+        attrs["decoding"] = "async"
+        if Image is None:
+            return Markup(f'<img src="{escape(src)}"{_attrs(attrs)}>')
+        digest, source_width = self.source(filename)
+
+        def srcset(fmt):
+            return ", ".join(
+                f"{url_for('image_variant', width=w, fmt=fmt, filename=filename, v=digest)} {w}w"
+                for w in self.widths_for(source_width)
+            )
+
+        return Markup(
+            f'<picture><source type="image/webp" srcset="{escape(srcset("webp"))}" sizes="{escape(sizes)}">'
+            f'<img src="{escape(src)}" srcset="{escape(srcset("jpeg"))}" sizes="{escape(sizes)}"{_attrs(attrs)}>'
+            "</picture>"
+        )
+
+
+def _attrs(attrs):
+    return "".join(f' {name.replace("_", "-")}="{escape(value)}"' for name, value in attrs.items())
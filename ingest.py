@@ -0,0 +1,309 @@
+"""Build catalog JSON files from the certification Word documents.
+
+Expected document layout (one or more certifications per .docx):
+
+* ``Heading 1`` -- certification title; the first paragraph after it is the
+  short description.
+* ``Heading 2`` -- a section: "Who Can Apply", "Criteria", "Process",
+  "Benefits", "Levels" or "FAQ" (matched on keywords, case-insensitive).
+* ``Heading 3`` -- a criteria/benefit group, process step, level or FAQ
+  question inside a section.
+* List paragraphs are items; plain paragraphs are notes, descriptions or
+  answers. Levels may also be a table with Level/Label/Score/Focus/Description
+  columns, and process steps may be list items written "Step - description".
+
+Parsed sections are cached by a hash of their content and whole documents by a
+hash of the file bytes, so re-ingesting only re-parses what changed. Documents
+that miss the cache are read in parallel in a process pool.
+"""
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+CACHE_FORMAT = 1
+
+SECTIONS = (
+    ("applicable", ("who can apply", "applicab", "eligib")),
+    ("criteria", ("criteria",)),
+    ("process", ("process",)),
+    ("benefits", ("benefit",)),
+    ("levels", ("level",)),
+    ("faq", ("faq", "frequently asked")),
+)
+
+LEVEL_COLUMNS = {
+    "level": "name", "name": "name", "label": "label", "certification": "label",
+    "score": "score", "focus": "focus", "focus areas": "focus",
+    "description": "desc", "desc": "desc",
+}
+
+STEP_SEPARATOR = re.compile(r"\s+[-\u2013\u2014]\s+|:\s+")
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def slugify(title):
+    title = re.sub(r"\bcertification\b", "", title, flags=re.I)
+    return re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+
+
+def read_blocks(path):
+    """Flatten a .docx into (kind, payload) tuples: h1/h2/h3/p/li text or table rows."""
+    # Imported here: python-docx costs ~40 ms and only `flask ingest` needs it,
+    # not every web worker that imports the app
+    import docx
+    from docx.table import Table
+
+    blocks = []
+    for item in docx.Document(path).iter_inner_content():
+        if isinstance(item, Table):
+            rows = [[cell.text.strip() for cell in row.cells] for row in item.rows]
+            blocks.append(("table", rows))
+            continue
+        text = item.text.strip()
+        if not text:
+            continue
+        style = item.style.name if item.style is not None else ""
+        if style.startswith("Heading") and style[-1:] in "123":
+            blocks.append(("h" + style[-1], text))
+        elif style.startswith("List"):
+            blocks.append(("li", text))
+        else:
+            blocks.append(("p", text))
+    return blocks
+
+
+def split_certifications(blocks):
+    """Group blocks into [(title, intro_blocks, [(section_title, blocks), ...])]."""
+    certs = []
+    for kind, payload in blocks:
+        if kind == "h1":
+            certs.append((payload, [], []))
+        elif not certs:
+            continue
+        elif kind == "h2":
+            certs[-1][2].append((payload, []))
+        elif certs[-1][2]:
+            certs[-1][2][-1][1].append((kind, payload))
+        else:
+            certs[-1][1].append((kind, payload))
+    return certs
+
+
+def section_kind(title):
+    lowered = title.lower()
+    for kind, keywords in SECTIONS:
+        if any(k in lowered for k in keywords):
+            return kind
+    return None
+
+
+def _groups(blocks, default_title):
+    """Heading 3 + list items -> [{"title", "items"}], plus trailing note paragraphs."""
+    groups, notes = [], []
+    for kind, text in blocks:
+        if kind == "h3":
+            groups.append({"title": text, "items": []})
+        elif kind == "li":
+            if not groups:
+                groups.append({"title": default_title, "items": []})
+            groups[-1]["items"].append(text)
+        elif kind == "p":
+            notes.append(text)
+    return groups, " ".join(notes)
+
+
+def parse_applicable(blocks, title):
+    paragraphs = [text for kind, text in blocks if kind == "p"]
+    return {
+        "applicable": paragraphs[0] if paragraphs else "",
+        "suitable_for": [text for kind, text in blocks if kind == "li"],
+        "applicable_note": " ".join(paragraphs[1:]),
+    }
+
+
+def parse_criteria(blocks, title):
+    groups, note = _groups(blocks, title)
+    return {"criteria": groups, "criteria_note": note}
+
+
+def parse_benefits(blocks, title):
+    return {"benefits": _groups(blocks, title)[0]}
+
+
+def parse_process(blocks, title):
+    steps = []
+    for kind, text in blocks:
+        if kind == "h3":
+            steps.append({"step": text, "desc": ""})
+        elif kind == "li":
+            parts = STEP_SEPARATOR.split(text, maxsplit=1)
+            step, desc = parts[0], parts[1] if len(parts) > 1 else ""
+            steps.append({"step": step, "desc": desc})
+        elif kind == "p" and steps:
+            steps[-1]["desc"] = (steps[-1]["desc"] + " " + text).strip()
+    return {"process": steps}
+
+
+def _level(name, **fields):
+    level = {"name": name, "label": f"{name} Certification", "score": "", "focus": "", "desc": ""}
+    level.update({k: v for k, v in fields.items() if v})
+    return level
+
+
+def parse_levels(blocks, title):
+    levels = []
+    for kind, payload in blocks:
+        if kind == "table" and payload:
+            columns = [LEVEL_COLUMNS.get(h.lower()) for h in payload[0]]
+            for row in payload[1:]:
+                fields = {col: value for col, value in zip(columns, row) if col}
+                if fields.get("name"):
+                    levels.append(_level(**fields))
+        elif kind == "h3":
+            levels.append(_level(payload))
+        elif levels and kind in ("p", "li"):
+            key, sep, value = payload.partition(":")
+            field = LEVEL_COLUMNS.get(key.strip().lower()) if sep else None
+            if field and field != "name":
+                levels[-1][field] = value.strip()
+            else:
+                levels[-1]["desc"] = (levels[-1]["desc"] + " " + payload).strip()
+    return {"levels": levels}
+
+
+def parse_faq(blocks, title):
+    faq = []
+    for kind, text in blocks:
+        is_question = kind == "h3" or text.endswith("?") or text[:2].upper() == "Q:"
+        # A "?" paragraph straight after an unanswered question is its answer
+        awaiting_answer = faq and not faq[-1]["a"] and kind != "h3"
+        if is_question and not awaiting_answer:
+            faq.append({"q": re.sub(r"^Q:\s*", "", text, flags=re.I), "a": ""})
+        elif faq:
+            answer = re.sub(r"^A:\s*", "", text, flags=re.I)
+            faq[-1]["a"] = (faq[-1]["a"] + " " + answer).strip()
+    return {"faq": faq}
+
+
+PARSERS = {
+    "applicable": parse_applicable,
+    "criteria": parse_criteria,
+    "process": parse_process,
+    "benefits": parse_benefits,
+    "levels": parse_levels,
+    "faq": parse_faq,
+}
+
+
+def section_hash(kind, title, blocks):
+    return hashlib.sha256(json.dumps([CACHE_FORMAT, kind, title, blocks]).encode()).hexdigest()
+
+
+def parse_document(path, section_cache):
+    """Parse one document; returns (certifications, newly parsed sections)."""
+    parsed, new_sections = [], {}
+    for title, intro, sections in split_certifications(read_blocks(path)):
+        paragraphs = [text for kind, text in intro if kind == "p"]
+        cert = {"title": title, "short": paragraphs[0] if paragraphs else ""}
+        for section_title, blocks in sections:
+            kind = section_kind(section_title)
+            if kind is None:
+                continue
+            key = section_hash(kind, section_title, blocks)
+            fields = section_cache.get(key)
+            if fields is None:
+                fields = new_sections[key] = PARSERS[kind](blocks, section_title)
+            cert.update(fields)
+        parsed.append(cert)
+    return parsed, new_sections
+
+
+def _parse_job(args):
+    path, section_cache = args
+    return parse_document(path, section_cache)
+
+
+class IngestCache:
+    """On-disk cache: document hash -> parsed certifications, section hash -> fields."""
+
+    def __init__(self, path):
+        self.path = path
+        self.documents, self.sections = {}, {}
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            if data.get("format") == CACHE_FORMAT:
+                self.documents, self.sections = data["documents"], data["sections"]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"format": CACHE_FORMAT, "documents": self.documents, "sections": self.sections}, f)
+        os.replace(tmp, self.path)
+
+
+def ingest(paths, cache, jobs=None):
+    """Parse documents, skipping any whose content hash is already cached.
+
+    Returns (certifications in document order, number of documents parsed).
+    """
+    hashes = {path: file_hash(path) for path in paths}
+    todo = [path for path in paths if hashes[path] not in cache.documents]
+    if len(todo) > 1 and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_parse_job, [(path, cache.sections) for path in todo]))
+    else:
+        results = [parse_document(path, cache.sections) for path in todo]
+    for path, (certs, sections) in zip(todo, results):
+        cache.documents[hashes[path]] = certs
+        cache.sections.update(sections)
+    # Drop entries for documents that are no longer part of the input
+    live = set(hashes.values())
+    cache.documents = {h: certs for h, certs in cache.documents.items() if h in live}
+    certs = [cert for path in paths for cert in cache.documents[hashes[path]]]
+    return certs, len(todo)
+
+
+def write_catalog(certs, cert_dir):
+    """Write/merge certifications into cert_dir; only changed files are touched.
+
+    Category and icon are not part of the documents, so they are kept from the
+    existing JSON file. A certification whose title matches an existing file
+    keeps that file's slug.
+    """
+    existing = {}
+    for fname in os.listdir(cert_dir):
+        if fname.endswith(".json"):
+            with open(os.path.join(cert_dir, fname)) as f:
+                existing[fname[:-5]] = json.load(f)
+    slug_by_title = {data["title"]: slug for slug, data in existing.items()}
+
+    written = []
+    for cert in certs:
+        slug = slug_by_title.get(cert["title"]) or slugify(cert["title"])
+        old = existing.get(slug, {})
+        data = {"title": cert["title"], "category": old.get("category", ""), "icon": old.get("icon", "")}
+        for key in ("short", "applicable", "suitable_for", "applicable_note", "criteria",
+                    "criteria_note", "process", "benefits", "levels", "faq"):
+            default = [] if key in ("suitable_for", "criteria", "process", "benefits", "levels", "faq") else ""
+            data[key] = cert.get(key, old.get(key, default))
+        if data == old:
+            continue
+        path = os.path.join(cert_dir, slug + ".json")
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        os.replace(tmp, path)
+        written.append(slug)
+    return written
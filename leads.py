@@ -0,0 +1,266 @@
+import atexit
+import csv
+import io
+import json
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from streams import drain
+
+log = logging.getLogger(__name__)
+
+INDUSTRY_CHOICES = (
+    "Manufacturing", "Real Estate & Infrastructure", "Hospitality & Tourism", "Agriculture & Food",
+    "Logistics & Supply Chain", "IT & Services", "Export Business", "Other",
+)
+NOT_SURE = "Not sure - Need guidance"
+TYPE_CHOICES = ("Book Consultation", "Request Proposal", "General Inquiry")
+
+FIELDS = ("name", "email", "phone", "company", "industry", "interest", "type", "message")
+COLUMNS = ("id", "created_at") + FIELDS
+FILTERS = ("industry", "interest", "type")
+MAX_LENGTHS = {"name": 100, "email": 254, "phone": 20, "company": 200, "message": 5000}
+
+EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+PHONE = re.compile(r"^[0-9+()\-.\s]{6,20}$")
+
+PER_PAGE = 50
+EXPORT_CHUNK = 500
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+# Cells a spreadsheet would run as a formula; exported with a leading quote
+FORMULA_START = ("=", "+", "-", "@", "\t", "\r")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    phone TEXT NOT NULL DEFAULT '',
+    company TEXT NOT NULL DEFAULT '',
+    industry TEXT NOT NULL DEFAULT '',
+    interest TEXT NOT NULL DEFAULT '',
+    type TEXT NOT NULL DEFAULT '',
+    message TEXT NOT NULL DEFAULT ''
+);
+-- The admin filters; each index ends in the rowid, so a filtered page is
+-- read newest first straight off the index
+CREATE INDEX IF NOT EXISTS leads_industry ON leads (industry);
+CREATE INDEX IF NOT EXISTS leads_interest ON leads (interest);
+CREATE INDEX IF NOT EXISTS leads_type ON leads (type);
+"""
+
+
+def interest_choices(catalog):
+    return tuple(cert.title for cert in catalog.certifications.values()) + (NOT_SURE,)
+
+
+def validate(form, catalog):
+    """Return (lead, errors); lead holds the cleaned values for every field."""
+    lead, errors = {}, {}
+    for name in FIELDS:
+        value = form.get(name)
+        if value is None or isinstance(value, str):
+            lead[name] = (value or "").strip()
+        else:
+            # A JSON body may carry numbers, lists or objects
+            lead[name] = ""
+            errors[name] = "Please enter text."
+    for name, limit in MAX_LENGTHS.items():
+        if len(lead[name]) > limit:
+            errors[name] = f"Please keep this under {limit} characters."
+    if not lead["name"]:
+        errors.setdefault("name", "Please enter your name.")
+    if not lead["email"]:
+        errors.setdefault("email", "Please enter your email address.")
+    elif not EMAIL.match(lead["email"]):
+        errors["email"] = "Please enter a valid email address."
+    if lead["phone"] and not PHONE.match(lead["phone"]):
+        errors["phone"] = "Please enter a valid phone number."
+    choices = {"industry": INDUSTRY_CHOICES, "interest": interest_choices(catalog), "type": TYPE_CHOICES}
+    for name, allowed in choices.items():
+        if lead[name] and lead[name] not in allowed:
+            errors[name] = "Please pick one of the listed options."
+    return lead, errors
+
+
+class LeadWriter:
+    """Queue leads in memory and commit them to SQLite in batches from one thread.
+
+    submit() never touches the disk: it only enqueues. The writer thread
+    blocks for the first lead, then drains whatever else arrives within
+    flush_interval (up to batch_size) and commits it in a single
+    transaction, so a burst costs one WAL fsync per batch.
+    """
+
+    def __init__(self, path, batch_size=200, flush_interval=0.25, max_queue=10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(max_queue)
+        self.lock = threading.Lock()
+        self.thread = None
+        self.pid = None
+
+    def connect(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # FULL syncs the WAL on every commit: one fsync per batch, nothing lost on power cut
+        conn.execute("PRAGMA synchronous=FULL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def start(self):
+        # Started lazily so each forked worker gets its own thread and connection
+        with self.lock:
+            if self.thread is not None and self.pid == os.getpid() and self.thread.is_alive():
+                return
+            if self.pid != os.getpid():
+                # A fork inherits the parent's queue, not its thread
+                self.queue = queue.Queue(self.queue.maxsize)
+                self.pid = os.getpid()
+                atexit.register(self.close)
+            self.thread = threading.Thread(target=self._run, name="lead-writer", daemon=True)
+            self.thread.start()
+
+    def submit(self, lead):
+        """Enqueue a validated lead; raises queue.Full when the writer is backed up."""
+        if self.thread is None or self.pid != os.getpid() or not self.thread.is_alive():
+            self.start()
+        row = dict(lead, created_at=datetime.now(timezone.utc).isoformat(timespec="seconds"))
+        self.queue.put_nowait(row)
+
+    def close(self, timeout=10):
+        """Flush everything queued so far and stop the writer thread."""
+        if self.thread is None or self.pid != os.getpid() or not self.thread.is_alive():
+            return
+        self.queue.put(None)
+        self.thread.join(timeout)
+
+    def _run(self):
+        conn = None
+        stopping = False
+        while not stopping:
+            first = self.queue.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                if conn is None:
+                    conn = self.connect()
+                self._write(conn, batch)
+            except Exception:
+                # Whatever went wrong, the writer carries on with the next
+                # batch on a fresh connection rather than leaving the queue undrained
+                log.exception("dropping %d leads: %r", len(batch), batch)
+                if conn is not None:
+                    conn.close()
+                    conn = None
+        if conn is not None:
+            conn.close()
+
+    def _write(self, conn, batch):
+        columns = ("created_at",) + FIELDS
+        sql = f"INSERT INTO leads ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        for attempt in range(3):
+            try:
+                with conn:
+                    conn.executemany(sql, [tuple(row[c] for c in columns) for row in batch])
+                return
+            except sqlite3.OperationalError as exc:
+                # Another worker holding the write lock past the busy timeout
+                log.warning("lead batch of %d failed (attempt %d): %s", len(batch), attempt + 1, exc)
+        log.error("dropping %d leads after repeated write failures: %r", len(batch), batch)
+
+
+def _where(filters, before=None):
+    clauses = [f"{name} = ?" for name in FILTERS if filters.get(name)]
+    params = [filters[name] for name in FILTERS if filters.get(name)]
+    if before is not None:
+        clauses.append("id < ?")
+        params.append(before)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def _csv_cell(value):
+    return "'" + value if isinstance(value, str) and value.startswith(FORMULA_START) else value
+
+
+class LeadReader:
+    """The admin's side of the leads table: keyset pages and streamed exports.
+
+    Pages are read newest first and continue from the last id seen, so
+    page 1000 costs what page 1 does. An export steps one cursor through
+    the matching rows on a connection of its own, holding EXPORT_CHUNK rows
+    at a time whatever the number of leads; being a single statement it
+    sees one consistent snapshot while the writer carries on.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+
+    def connect(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None or self.local.pid != os.getpid():
+            conn = self.local.conn = self.connect()
+            self.local.pid = os.getpid()
+        return conn
+
+    def page(self, filters, before=None, limit=PER_PAGE):
+        """One page of leads, newest first -> (leads, cursor of the next page or None)."""
+        where, params = _where(filters, before)
+        rows = self.connection().execute(
+            f"SELECT {', '.join(COLUMNS)} FROM leads{where} ORDER BY id DESC LIMIT ?", (*params, limit + 1)
+        ).fetchall()
+        leads = [dict(zip(COLUMNS, row)) for row in rows[:limit]]
+        return leads, rows[limit - 1][0] if len(rows) > limit else None
+
+    def export(self, filters, fmt):
+        """Yield the matching leads, newest first, as CSV or NDJSON text chunks."""
+        out = io.StringIO()
+        writer = csv.writer(out)
+        if fmt == "csv":
+            # Sent before the query runs, so the download starts at once
+            writer.writerow(COLUMNS)
+            yield drain(out)
+        where, params = _where(filters)
+        conn = self.connect()
+        try:
+            cursor = conn.execute(f"SELECT {', '.join(COLUMNS)} FROM leads{where} ORDER BY id DESC", params)
+            while rows := cursor.fetchmany(EXPORT_CHUNK):
+                if fmt == "csv":
+                    writer.writerows([_csv_cell(value) for value in row] for row in rows)
+                else:
+                    for row in rows:
+                        out.write(json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False))
+                        out.write("\n")
+                yield drain(out)
+        finally:
+            # Also runs when the client disconnects and the server closes the generator
+            conn.close()
@@ -0,0 +1,220 @@
+import bisect
+import fcntl
+import json
+import os
+import threading
+import time
+
+from flask import Response, g, request, before_render_template, template_rendered
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+HISTOGRAMS = {
+    "http_request_duration_seconds": ("Time spent handling the request", LATENCY_BUCKETS),
+    "template_render_seconds": ("Time spent rendering templates per request", LATENCY_BUCKETS),
+    "http_response_size_bytes": ("Response body size", SIZE_BUCKETS),
+}
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Metrics:
+    """Per-endpoint histograms with one shard per thread, summed across workers.
+
+    observe() only touches the calling thread's shard, so it needs no lock.
+    Each process periodically writes its totals to <dir>/<boot>-<pid>.json;
+    /metrics adds up every file from the same boot (the master's import),
+    folding those of exited workers into an archive so counts survive
+    recycling without the directory growing.
+    """
+
+    def __init__(self, directory, flush_interval=5.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.boot = f"{os.getpid()}.{int(time.time())}"
+        self.local = threading.local()
+        self.shards = []
+        self.lock = threading.Lock()
+        self.flusher_pid = None
+
+    def shard(self):
+        shard = getattr(self.local, "shard", None)
+        if shard is None or self.local.pid != os.getpid():
+            shard = self.local.shard = {}
+            self.local.pid = os.getpid()
+            with self.lock:
+                if self.flusher_pid != os.getpid():
+                    # Shards are per process: forget the parent's after a fork
+                    self.shards = []
+                    self.flusher_pid = os.getpid()
+                    threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True).start()
+                self.shards.append(shard)
+        return shard
+
+    def observe(self, name, labels, value):
+        shard = self.shard()
+        key = (name, labels)
+        series = shard.get(key)
+        if series is None:
+            # bucket counts..., +Inf count, sum
+            series = shard[key] = [0] * (len(HISTOGRAMS[name][1]) + 1) + [0.0]
+        series[bisect.bisect_left(HISTOGRAMS[name][1], value)] += 1
+        series[-1] += value
+
+    def snapshot(self):
+        """This process's totals as {"name\\tlabels": [counts..., sum]}."""
+        total = {}
+        with self.lock:
+            shards = list(self.shards)
+        for shard in shards:
+            for (name, labels), series in list(shard.items()):
+                _add(total, f"{name}\t{labels}", series)
+        return total
+
+    def _path(self, pid):
+        return os.path.join(self.directory, f"{self.boot}-{pid}.json")
+
+    def flush(self):
+        if self.flusher_pid != os.getpid():
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(os.getpid())
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp, path)
+
+    def _flush_loop(self):
+        pid = os.getpid()
+        while True:
+            time.sleep(self.flush_interval)
+            if pid != os.getpid():
+                return
+            self.flush()
+
+    def collect(self):
+        """Totals of every worker of this server, live or exited."""
+        os.makedirs(self.directory, exist_ok=True)
+        self.flush()
+        total = {}
+        archive_path = os.path.join(self.directory, f"{self.boot}-archive.json")
+        with open(os.path.join(self.directory, ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            archive = _read(archive_path)
+            archived = False
+            for fname in os.listdir(self.directory):
+                path = os.path.join(self.directory, fname)
+                if not fname.endswith(".json") or fname == os.path.basename(archive_path):
+                    continue
+                if not fname.startswith(self.boot + "-"):
+                    # Left over from an earlier run
+                    os.unlink(path)
+                    continue
+                data = _read(path)
+                if _alive(int(fname[len(self.boot) + 1:-5])):
+                    for key, series in data.items():
+                        _add(total, key, series)
+                else:
+                    for key, series in data.items():
+                        _add(archive, key, series)
+                    os.unlink(path)
+                    archived = True
+            if archived:
+                with open(archive_path + ".tmp", "w") as f:
+                    json.dump(archive, f)
+                os.replace(archive_path + ".tmp", archive_path)
+        for key, series in archive.items():
+            _add(total, key, series)
+        return total
+
+    def exposition(self):
+        """Prometheus text format of collect()."""
+        by_name = {}
+        for key, series in self.collect().items():
+            name, labels = key.split("\t", 1)
+            by_name.setdefault(name, []).append((labels, series))
+        lines = []
+        for name, (help_text, bounds) in HISTOGRAMS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, series in sorted(by_name.get(name, ())):
+                cumulative = 0
+                for bound, count in zip(bounds + ("+Inf",), series[:-1]):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {series[-1]}")
+                lines.append(f"{name}_count{{{labels}}} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def install(self, app, server_timing=False):
+        """Time every request of app; register this before other request hooks."""
+
+        @app.before_request
+        def start_timer():
+            g.metrics_start = time.perf_counter()
+            g.metrics_render = 0.0
+
+        def render_started(sender, template, context, **extra):
+            g.metrics_render_start = time.perf_counter()
+
+        def render_finished(sender, template, context, **extra):
+            start = g.pop("metrics_render_start", None)
+            if start is not None:
+                g.metrics_render += time.perf_counter() - start
+
+        before_render_template.connect(render_started, app, weak=False)
+        template_rendered.connect(render_finished, app, weak=False)
+
+        @app.after_request
+        def record(resp):
+            start = g.get("metrics_start")
+            if start is None:
+                return resp
+            elapsed = time.perf_counter() - start
+            render = g.metrics_render
+            labels = f'endpoint="{request.endpoint or "none"}",method="{request.method}"'
+            self.observe("http_request_duration_seconds", labels, elapsed)
+            if render:
+                self.observe("template_render_seconds", labels, render)
+            # Measuring a streamed body would read the whole stream into memory
+            size = None if resp.is_streamed else resp.calculate_content_length()
+            if size is not None:
+                self.observe("http_response_size_bytes", labels, size)
+            if server_timing:
+                parts = [f"app;dur={elapsed * 1000:.2f}"]
+                if render:
+                    parts.append(f"render;dur={render * 1000:.2f}")
+                resp.headers.add("Server-Timing", ", ".join(parts))
+            return resp
+
+    def view(self):
+        return Response(self.exposition(), content_type=CONTENT_TYPE)
+
+
+def _add(total, key, series):
+    current = total.get(key)
+    if current is None:
+        total[key] = list(series)
+    else:
+        for i, value in enumerate(series):
+            current[i] += value
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _alive(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, make_response, request
+
+import compress
+
+
+def templates_digest(app):
+    """Hash of every template source, so a deploy with new markup changes ETags."""
+    h = hashlib.sha256()
+    root = os.path.join(app.root_path, app.template_folder)
+    for dirpath, dirs, files in sorted(os.walk(root)):
+        dirs.sort()
+        for fname in sorted(files):
+            with open(os.path.join(dirpath, fname), "rb") as f:
+                h.update(fname.encode() + b"\0" + f.read())
+    return h.hexdigest()
+
+
+class PageCache:
+    """LRU of rendered pages keyed by view, endpoint, slug, encoding and catalog version.
+
+    The catalog version is part of every key and ETag, so a catalog change
+    simply misses the cache; stale entries age out of the LRU on their own.
+    """
+
+    def __init__(self, version, salt="", maxsize=256, enabled=True):
+        self.version = version
+        self.salt = salt
+        self.maxsize = maxsize
+        self.enabled = enabled
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def etag(self, key):
+        return hashlib.sha256(repr((self.salt,) + key).encode()).hexdigest()[:32]
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def cached(self, view=None, *, query=()):
+        """Decorator; pages with a query string are rendered every time unless
+        every parameter is named in query; their values then join the key."""
+        if view is None:
+            return lambda view: self.cached(view, query=query)
+        name = view.__name__
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not self.enabled or request.method not in ("GET", "HEAD"):
+                return view(*args, **kwargs)
+            if request.query_string and not request.args.keys() <= set(query):
+                return view(*args, **kwargs)
+            encoding = compress.negotiate(request.accept_encodings)
+            # request.endpoint differs from name for error handlers, and the
+            # navbar highlights the active endpoint, so both are keyed
+            key = (name, request.endpoint, kwargs.get("slug"), encoding, self.version())
+            if query:
+                key += tuple(tuple(request.args.getlist(param)) for param in query)
+            etag = self.etag(key)
+            entry = self.get(key)
+            # Only successful pages carry an ETag, so a match means a 200 page
+            if (entry is None or entry[0] == 200) and request.if_none_match.contains(etag):
+                return self._respond(304, None, b"", encoding, etag)
+            if entry is None:
+                resp = make_response(view(*args, **kwargs))
+                if resp.is_streamed or resp.status_code not in (200, 404):
+                    return resp
+                entry = (resp.status_code, resp.mimetype, compress.compress(resp.get_data(), encoding))
+                self.put(key, entry)
+            status, mimetype, body = entry
+            return self._respond(status, mimetype, body, encoding, etag if status == 200 else None)
+
+        return wrapper
+
+    def _respond(self, status, mimetype, body, encoding, etag):
+        resp = Response(body, status=status, mimetype=mimetype)
+        if status == 304:
+            resp.headers.pop("Content-Type", None)
+        elif encoding != "identity":
+            resp.headers["Content-Encoding"] = encoding
+        if etag:
+            resp.set_etag(etag)
+        resp.vary.add("Accept-Encoding")
+        return resp
@@ -0,0 +1,75 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+log = logging.getLogger(__name__)
+
+
+class RenderPool:
+    """A process pool for renders requests do not wait on, one job per key at a time.
+
+    The pool is started on first use in each process, from the forkserver:
+    forked from a process whose request threads may hold locks, a pool
+    process could deadlock. A pool broken by a dead process (a crash, the
+    OOM killer) is replaced on the next submit.
+    """
+
+    def __init__(self, workers, label):
+        self.workers = workers
+        self.label = label
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.pool = None
+        self.pool_pid = None
+
+    def submit(self, key, fn, *args):
+        """Future of fn(*args); while a job for key is running, that job's future."""
+        with self.lock:
+            if self.pool is None or self.pool_pid != os.getpid():
+                # The parent's futures never finish in a forked child
+                self.pool, self.pool_pid, self.pending = self._new_pool(), os.getpid(), {}
+            future = self.pending.get(key)
+            # A finished one is only waiting for _done to clear it
+            if future is not None and not future.done():
+                return future
+            try:
+                future = self.pool.submit(fn, *args)
+            except BrokenProcessPool:
+                self.pool = self._new_pool()
+                future = self.pool.submit(fn, *args)
+            self.pending[key] = future
+        future.add_done_callback(lambda f: self._done(key, f))
+        return future
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("forkserver"))
+
+    def _done(self, key, future):
+        with self.lock:
+            if self.pending.get(key) is future:
+                del self.pending[key]
+        if future.exception() is not None:
+            log.error("%s %s failed: %s", self.label, key, future.exception())
+
+
+def run_all(fn, jobs, workers, label):
+    """Run fn(*args) for every key -> args in jobs and wait for them all.
+
+    Returns how many succeeded; a failed job is logged and the rest go on.
+    Meant for the CLI and serve.py's master: with no request threads there,
+    plain forked processes are safe, and a forkserver started in the master
+    would be inherited by workers that cannot wait on it.
+    """
+    made = 0
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {key: pool.submit(fn, *args) for key, args in jobs.items()}
+            for key, future in futures.items():
+                if future.exception() is None:
+                    made += 1
+                else:
+                    log.error("%s %s failed: %s", label, key, future.exception())
+    return made
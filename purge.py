@@ -0,0 +1,204 @@
+import logging
+import threading
+import urllib.request
+
+from flask import request
+
+log = logging.getLogger(__name__)
+
+# Certification fields shown in category listings, fed to the search index
+# and to the recommender; a change elsewhere only affects the cert's own page
+LISTED_FIELDS = ("title", "short", "icon")
+SEARCH_FIELDS = ("title", "short", "applicable", "suitable_for", "criteria", "benefits", "faq")
+RECOMMEND_FIELDS = ("title", "short", "applicable", "suitable_for", "criteria", "benefits")
+
+
+def surrogate_keys(catalog, endpoint, view_args, args):
+    """Cache tags of a response: what in the catalog it was rendered from.
+
+    nav        the navbar: category titles and membership, cert titles
+    cert:S     everything about certification S
+    category:C category C's title, description and its certs' listed fields
+    industries industry names, descriptions and icons
+    recommend  anything the recommender reads
+    search     anything the search index reads
+    api:list   /api/v1/certifications pages, which embed every field
+    registry   registry listing pages; registry data is not in the catalog,
+               so whatever adds listings purges it, but the filters list
+               cert titles and level names
+    badges     every badge, which shows its cert's title
+    certificate:ID  one certificate's verification and badges
+    """
+    view_args = view_args or {}
+    if endpoint in ("certification_detail", "api_certification", "assessment", "assessment_csv", "api_score",
+                    "brochure"):
+        slug = view_args.get("slug", "")
+        keys = [f"cert:{slug}"]
+        cert = catalog.certifications.get(slug)
+        if cert is not None and cert.category:
+            keys.append(f"category:{cert.category}")
+        if endpoint in ("certification_detail", "assessment"):
+            keys.append("nav")
+        return keys
+    categories = [f"category:{cat.id}" for cat in catalog.categories]
+    if endpoint == "home":
+        return ["nav", "industries", *categories]
+    if endpoint == "certifications":
+        return ["nav", *categories]
+    if endpoint == "industries":
+        return ["nav", "industries", "recommend"]
+    if endpoint == "contact":
+        return ["nav"]
+    if endpoint == "search":
+        return ["nav", "search"]
+    if endpoint in ("api_search", "api_search_suggest"):
+        return ["search"]
+    if endpoint == "api_recommend":
+        return ["recommend"]
+    if endpoint == "api_certifications":
+        category = args.get("category")
+        return ["api:list", f"category:{category}"] if category else ["api:list"]
+    if endpoint in ("compare", "api_compare"):
+        slugs = sorted({s for value in args.getlist("slugs") for s in value.split(",") if s})
+        keys = [f"cert:{slug}" for slug in slugs]
+        return ["nav", *keys] if endpoint == "compare" else keys
+    if endpoint in ("registry_search", "api_registry"):
+        return ["nav", "registry"] if endpoint == "registry_search" else ["registry"]
+    if endpoint in ("verify", "api_verify", "badge"):
+        key = f"certificate:{view_args.get('certificate_id', '').strip().upper()}"
+        if endpoint == "badge":
+            return ["badges", key]
+        return ["nav", key] if endpoint == "verify" else [key]
+    if endpoint == "icon_sprite":
+        return ["icons"]
+    if endpoint is None:
+        # Error pages render the navbar too
+        return ["nav"]
+    return [endpoint]
+
+
+def _category_keys(*certs):
+    # A cert outside every category has no category page to purge
+    return {f"category:{cert.category}" for cert in certs if cert.category}
+
+
+def changed_keys(old, new):
+    """Tags whose responses differ between catalog snapshots old and new."""
+    keys = set()
+    for slug in old.certifications.keys() | new.certifications.keys():
+        a, b = old.certifications.get(slug), new.certifications.get(slug)
+        if a is None or b is None:
+            keys |= {f"cert:{slug}", "nav", "search", "recommend", "api:list", "registry", "badges"}
+            keys |= _category_keys(a or b)
+            continue
+        # Records compare by identity; compare their plain values
+        da, db = a.as_dict(), b.as_dict()
+        changed = {name for name in da if da[name] != db[name]}
+        if not changed:
+            continue
+        keys |= {f"cert:{slug}", "api:list"}
+        if "category" in changed:
+            keys |= _category_keys(a, b) | {"nav"}
+        if "title" in changed:
+            keys |= {"nav", "registry", "badges"}
+        if [lv.name for lv in a.levels] != [lv.name for lv in b.levels]:
+            keys.add("registry")
+        if changed.intersection(LISTED_FIELDS):
+            keys |= _category_keys(b)
+        if changed.intersection(SEARCH_FIELDS):
+            keys.add("search")
+        if changed.intersection(RECOMMEND_FIELDS):
+            keys.add("recommend")
+
+    old_cats = {cat.id: cat for cat in old.categories}
+    new_cats = {cat.id: cat for cat in new.categories}
+    if list(old_cats) != list(new_cats):
+        keys.add("nav")
+    for cat_id in old_cats.keys() | new_cats.keys():
+        a, b = old_cats.get(cat_id), new_cats.get(cat_id)
+        if a is None or b is None or a.as_dict() != b.as_dict():
+            keys.add(f"category:{cat_id}")
+            if a is None or b is None or a.title != b.title or a.certs != b.certs:
+                keys.add("nav")
+
+    if [ind.as_dict() for ind in old.industries] != [ind.as_dict() for ind in new.industries]:
+        keys |= {"industries", "recommend"}
+    if old.indexes.get("icons") and new.indexes.get("icons"):
+        if old.indexes["icons"].version != new.indexes["icons"].version:
+            keys.add("icons")
+    return keys
+
+
+class Purger:
+    """Send targeted purges to the fronting cache when the catalog changes.
+
+    One request per batch of keys: `method url` with the keys, space
+    separated, in `header` (Varnish xkey, Fastly-style and most
+    surrogate-key caches accept some variant; adjust method and header).
+    Purges run on a background thread so the reloading request is not held
+    up, and failures are logged, not raised: the cache's TTL still bounds
+    staleness.
+
+    Under serve.py the purger is deferred: each worker reloads on its own,
+    so a purge from any one of them would be repeated by the others and
+    could be undone by a sibling still serving the old catalog. Changed
+    keys are collected instead, and the master sends them with flush()
+    once every worker of the old catalog has exited.
+    """
+
+    def __init__(self, url, method="PURGE", header="Surrogate-Key", batch=64, timeout=5.0, deferred=False):
+        self.url = url
+        self.method = method
+        self.header = header
+        self.batch = batch
+        self.timeout = timeout
+        self.deferred = deferred
+        self.pending = set()
+        self.lock = threading.Lock()
+
+    def purge(self, keys):
+        """Purge keys now; returns the number of failed requests."""
+        keys = sorted(keys)
+        failed = 0
+        for start in range(0, len(keys), self.batch):
+            chunk = keys[start:start + self.batch]
+            req = urllib.request.Request(self.url, method=self.method, headers={self.header: " ".join(chunk)})
+            try:
+                with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                    resp.read()
+            except OSError as exc:
+                failed += 1
+                log.error("purge of %s failed: %s", " ".join(chunk), exc)
+        return failed
+
+    def on_reload(self, old, new):
+        keys = changed_keys(old, new)
+        if not keys:
+            return None
+        if self.deferred:
+            with self.lock:
+                self.pending |= keys
+            return None
+        log.info("purging %d cache tags: %s", len(keys), " ".join(sorted(keys)))
+        thread = threading.Thread(target=self.purge, args=(keys,), name="cache-purge", daemon=True)
+        thread.start()
+        return thread
+
+    def flush(self):
+        """Purge the keys collected while deferred, in this thread; returns the number of failed requests."""
+        with self.lock:
+            keys, self.pending = self.pending, set()
+        if not keys:
+            return 0
+        log.info("purging %d cache tags: %s", len(keys), " ".join(sorted(keys)))
+        return self.purge(keys)
+
+
+def install(app, current_catalog, header="Surrogate-Key"):
+    """Tag every response of app with its surrogate keys."""
+
+    @app.after_request
+    def surrogate_key_header(resp):
+        keys = surrogate_keys(current_catalog(), request.endpoint, request.view_args, request.args)
+        resp.headers[header] = " ".join(keys)
+        return resp
@@ -0,0 +1,178 @@
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from functools import wraps
+
+from flask import jsonify, make_response, request
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+RULE = re.compile(r"^\s*(\d+)\s*/\s*(second|minute|hour|day)\s*(?:burst\s*=?\s*(\d+))?\s*$")
+
+
+def parse_rule(rule):
+    """'5/minute' or '5/minute burst 10' -> (tokens per second, bucket size)."""
+    match = RULE.match(rule)
+    if not match:
+        raise ValueError(f"bad rate limit rule: {rule!r}")
+    count, period, burst = match.groups()
+    return int(count) / PERIODS[period], int(burst or count)
+
+
+def client_ip():
+    # Behind a proxy, wrap the app in werkzeug's ProxyFix so this is the real client
+    return request.remote_addr
+
+
+def form_email():
+    source = request.get_json(silent=True) if request.is_json else request.form
+    email = source.get("email") if isinstance(source, Mapping) else None
+    # Anything but a string is rejected by the view; not a key to count
+    if not isinstance(email, str):
+        return None
+    return email.strip().lower() or None
+
+
+class MemoryBuckets:
+    """Token buckets in this process, striped over several locks.
+
+    Buckets refill lazily from their last timestamp, so no timers run. Each
+    stripe is an OrderedDict in last-touched order; a bucket idle for
+    burst / rate seconds is full again, so dropping it loses nothing, and
+    popping at most two expired buckets per call keeps expiry O(1).
+    """
+
+    def __init__(self, rate, burst, stripes=16):
+        self.rate = rate
+        self.burst = float(burst)
+        self.idle = burst / rate
+        self.mask = stripes - 1
+        assert stripes & self.mask == 0, "stripes must be a power of two"
+        self.stripes = [(threading.Lock(), OrderedDict()) for _ in range(stripes)]
+
+    def take(self, key, cost=1.0):
+        """Spend cost tokens; return 0.0 if allowed, else seconds until it would be."""
+        now = time.monotonic()
+        lock, buckets = self.stripes[hash(key) & self.mask]
+        with lock:
+            state = buckets.pop(key, None)
+            if state is None:
+                tokens = self.burst
+            else:
+                tokens = min(self.burst, state[0] + (now - state[1]) * self.rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / self.rate
+            buckets[key] = (tokens, now)
+            for _ in range(2):
+                oldest = next(iter(buckets))
+                if now - buckets[oldest][1] < self.idle:
+                    break
+                del buckets[oldest]
+            return wait
+
+
+class SqliteBuckets:
+    """Token buckets in a SQLite file, shared by every worker on the node."""
+
+    SCHEMA = "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, stamp REAL NOT NULL)"
+
+    def __init__(self, path, name, rate, burst):
+        self.path = path
+        self.prefix = name + ":"
+        self.rate = rate
+        self.burst = float(burst)
+        self.idle = burst / rate
+        self.local = threading.local()
+        self.calls = 0
+
+    def connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None or self.local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Limiter state is disposable; never wait on fsync for it
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(self.SCHEMA)
+            self.local.conn, self.local.pid = conn, os.getpid()
+        return conn
+
+    def take(self, key, cost=1.0):
+        now = time.time()
+        key = self.prefix + key
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, stamp FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens = self.burst if row is None else min(self.burst, row[0] + (now - row[1]) * self.rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / self.rate
+            conn.execute("INSERT OR REPLACE INTO buckets VALUES (?, ?, ?)", (key, tokens, now))
+            self.calls += 1
+            if self.calls % 1000 == 0:
+                conn.execute(
+                    "DELETE FROM buckets WHERE key >= ? AND key < ? AND stamp < ?",
+                    (self.prefix, self.prefix[:-1] + ";", now - self.idle),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
+
+
+class RateLimiter:
+    """Per-route token-bucket limits: @limiter.limit("5/minute", key=client_ip)."""
+
+    def __init__(self, backend="memory", db_path=None, enabled=True):
+        if backend not in ("memory", "sqlite"):
+            raise ValueError(f"unknown rate limit backend: {backend!r}")
+        self.backend = backend
+        self.db_path = db_path
+        self.enabled = enabled
+
+    def buckets(self, name, rule):
+        rate, burst = parse_rule(rule)
+        if self.backend == "sqlite":
+            return SqliteBuckets(self.db_path, name, rate, burst)
+        return MemoryBuckets(rate, burst)
+
+    def limit(self, rule, key=client_ip, methods=None, name=None):
+        """Reject with 429 once key() exceeds rule; a None key is not limited."""
+
+        def decorator(view):
+            buckets = self.buckets(name or f"{view.__name__}:{key.__name__}", rule)
+
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if self.enabled and (methods is None or request.method in methods):
+                    value = key()
+                    if value is not None:
+                        wait = buckets.take(value)
+                        if wait:
+                            return too_many_requests(wait)
+                return view(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+
+def too_many_requests(wait):
+    if request.accept_mimetypes.best == "application/json" or request.is_json:
+        resp = make_response(jsonify(error="Too many requests, please slow down."), 429)
+    else:
+        resp = make_response("Too many requests, please slow down.", 429)
+        resp.mimetype = "text/plain"
+    resp.headers["Retry-After"] = str(math.ceil(wait))
+    return resp
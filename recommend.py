@@ -0,0 +1,141 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from search import tokenize
+
+# Share of the score from each input; inputs left empty drop out and the
+# remaining weights are rescaled
+WEIGHTS = {"industry": 0.5, "type": 0.25, "goals": 0.25}
+# An industry's listed certifications, in order, outrank anything inferred
+# from suitable_for text
+LISTED_RELEVANCE = (1.0, 0.9, 0.8, 0.7, 0.6)
+TEXT_RELEVANCE = 0.5
+
+
+def terms(text):
+    # Crude plural folding so "Businesses"/"business", "Services"/"service" meet
+    out = []
+    for t in tokenize(text):
+        if t.endswith("ies") and len(t) > 4:
+            t = t[:-3] + "y"
+        elif t.endswith("sses") or t.endswith("shes") or t.endswith("ches"):
+            t = t[:-2]
+        elif t.endswith("s") and not t.endswith("ss") and len(t) > 3:
+            t = t[:-1]
+        out.append(t)
+    return out
+
+
+def _tfidf(docs, vocab):
+    """Rows of L2-normalized tf-idf weights for each list of terms in docs."""
+    m = np.zeros((len(docs), len(vocab)), dtype=np.float32)
+    for row, doc in enumerate(docs):
+        for t in doc:
+            if t in vocab:
+                m[row, vocab[t]] += 1.0
+    df = np.count_nonzero(m, axis=0)
+    m *= np.log1p(len(docs) / np.maximum(df, 1)).astype(np.float32)
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return m / np.where(norms == 0, 1, norms)
+
+
+class Recommender:
+    """Rank certifications for an (industry, company type, goals) request.
+
+    Built once per catalog version. relevance[i, c] scores certification c
+    for industry i from the industry's listed certifications plus the
+    tf-idf similarity of the industry's text to the certification's
+    suitable_for list. Company type is matched against suitable_for and
+    applicability text, goals against titles, summaries, criteria and
+    benefits; each is one matrix-vector product. Answers are memoized.
+    """
+
+    def __init__(self, catalog, cache_size=1024):
+        self.certs = list(catalog.certifications.values())
+        self.industries = list(catalog.industries)
+        slug_index = {cert.slug: i for i, cert in enumerate(self.certs)}
+
+        suited = [terms(" ".join(c.suitable_for)) for c in self.certs]
+        applicable = [terms(" ".join(c.suitable_for) + " " + c.applicable) for c in self.certs]
+        goals = [
+            terms(" ".join([c.title, c.short, *(i for g in c.criteria for i in g.items),
+                            *(i for g in c.benefits for i in g.items)]))
+            for c in self.certs
+        ]
+        industry_text = [terms(f"{ind.name} {ind.desc}") for ind in self.industries]
+        vocab = sorted({t for doc in applicable + goals + industry_text for t in doc})
+        self.vocab = {t: i for i, t in enumerate(vocab)}
+
+        listed = np.zeros((len(self.industries), len(self.certs)), dtype=np.float32)
+        for row, ind in enumerate(self.industries):
+            for rank, slug in enumerate(ind.certs):
+                listed[row, slug_index[slug]] = LISTED_RELEVANCE[min(rank, len(LISTED_RELEVANCE) - 1)]
+        similarity = _tfidf(industry_text, self.vocab) @ _tfidf(suited, self.vocab).T
+        relevance = listed + TEXT_RELEVANCE * similarity
+        self.relevance = relevance / np.maximum(relevance.max(axis=1, keepdims=True), 1e-9)
+        # With no usable industry, rank by relevance across all of them
+        self.prior = self.relevance.mean(axis=0) if len(self.industries) else np.zeros(len(self.certs))
+        self.type_matrix = _tfidf(applicable, self.vocab)
+        self.goal_matrix = _tfidf(goals, self.vocab)
+        self.industry_names = [set(terms(ind.name)) for ind in self.industries]
+
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+
+    def match_industry(self, text):
+        """Index of the industry whose name shares the most terms with text, or None."""
+        wanted = set(terms(text or ""))
+        best, best_overlap = None, 0
+        for row, names in enumerate(self.industry_names):
+            overlap = len(wanted & names)
+            if overlap > best_overlap:
+                best, best_overlap = row, overlap
+        return best
+
+    def _term_ids(self, text):
+        return tuple(sorted({self.vocab[t] for t in terms(text or "") if t in self.vocab}))
+
+    def _query(self, term_ids):
+        q = np.zeros(len(self.vocab), dtype=np.float32)
+        q[list(term_ids)] = 1.0 / np.sqrt(len(term_ids))
+        return q
+
+    def recommend(self, industry="", company_type="", goals="", limit=5):
+        """Return (industry or None, [(score, cert)] best first)."""
+        row = self.match_industry(industry)
+        type_ids = self._term_ids(company_type)
+        goal_ids = self._term_ids(goals)
+        # Requests differing only in wording the catalog doesn't use share an entry
+        key = (row, type_ids, goal_ids, limit)
+        with self.lock:
+            hit = self.cache.get(key)
+            if hit is not None:
+                self.cache.move_to_end(key)
+                return hit
+
+        parts = []
+        if row is not None:
+            parts.append((WEIGHTS["industry"], self.relevance[row]))
+        if type_ids:
+            parts.append((WEIGHTS["type"], self.type_matrix @ self._query(type_ids)))
+        if goal_ids:
+            parts.append((WEIGHTS["goals"], self.goal_matrix @ self._query(goal_ids)))
+        if not parts:
+            parts.append((1.0, self.prior))
+        total = sum(w for w, _ in parts)
+        scores = sum(w * s for w, s in parts) / total
+
+        hits = np.flatnonzero(scores > 0)
+        hits = hits[np.argsort(-scores[hits], kind="stable")][:limit]
+        result = (
+            self.industries[row] if row is not None else None,
+            [(float(scores[i]), self.certs[i]) for i in hits],
+        )
+        with self.lock:
+            self.cache[key] = result
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return result
@@ -0,0 +1,320 @@
+import hashlib
+import itertools
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+PER_PAGE = 20
+MAX_PER_PAGE = 100
+# Share of unknown certificate IDs the Bloom filter lets through to SQLite
+BLOOM_ERROR_RATE = 0.001
+# Certificate IDs: "GB-2025-7KQ2ZPMA" style, compared case-insensitively
+CERTIFICATE_ID = re.compile(r"^[A-Z0-9][A-Z0-9-]{5,39}$")
+FIELDS = ("certificate_id", "organization", "certification", "level", "industry", "city", "issued", "expires")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    id INTEGER PRIMARY KEY,
+    certificate_id TEXT NOT NULL UNIQUE,
+    organization TEXT NOT NULL,
+    certification TEXT NOT NULL,
+    level TEXT NOT NULL,
+    industry TEXT NOT NULL,
+    city TEXT NOT NULL DEFAULT '',
+    issued TEXT NOT NULL,
+    expires TEXT NOT NULL
+);
+-- Contentless: names live in listings. Besides the name, each listing is
+-- indexed under one facet token per combination of its certification,
+-- level and industry (facet_tokens()), so any filter, alone or with a name
+-- search, is one FTS5 query that intersects posting lists and walks them
+-- newest first, without sorting or reading rows that do not match (but see
+-- Registry.search() for a single filter with a name search)
+CREATE VIRTUAL TABLE IF NOT EXISTS listings_fts USING fts5(
+    organization, facets, content='', columnsize=0, prefix='2 3', tokenize='unicode61 remove_diacritics 2'
+);
+-- Registry.add() indexes new listings with one INSERT ... SELECT per batch,
+-- many times faster than an insert trigger
+CREATE TRIGGER IF NOT EXISTS listings_ad AFTER DELETE ON listings BEGIN
+    INSERT INTO listings_fts (listings_fts, rowid, organization, facets)
+    VALUES ('delete', old.id, old.organization, facet_tokens(old.certification, old.level, old.industry));
+END;
+CREATE TRIGGER IF NOT EXISTS listings_au AFTER UPDATE ON listings BEGIN
+    INSERT INTO listings_fts (listings_fts, rowid, organization, facets)
+    VALUES ('delete', old.id, old.organization, facet_tokens(old.certification, old.level, old.industry));
+    INSERT INTO listings_fts (rowid, organization, facets)
+    VALUES (new.id, new.organization, facet_tokens(new.certification, new.level, new.industry));
+END;
+"""
+
+
+def normalize_id(certificate_id):
+    """Canonical form of a certificate ID, or None when it cannot be one."""
+    certificate_id = (certificate_id or "").strip().upper()
+    return certificate_id if CERTIFICATE_ID.match(certificate_id) else None
+
+
+def facet_token(certification=None, level=None, industry=None):
+    """The token of one filter combination; None when nothing is filtered."""
+    parts = [f"{name}={value}" for name, value in
+             (("certification", certification), ("level", level), ("industry", industry)) if value]
+    if not parts:
+        return None
+    return "f" + hashlib.blake2b("\0".join(parts).encode(), digest_size=6).hexdigest()
+
+
+def facet_tokens(certification, level, industry):
+    """Every facet token of a listing: one per non-empty subset of its filters."""
+    values = {"certification": certification, "level": level, "industry": industry}
+    return " ".join(
+        facet_token(**{name: values[name] for name in subset})
+        for n in range(1, 4) for subset in itertools.combinations(values, n)
+    )
+
+
+def match_query(text, facet=None):
+    """Free text and a facet token -> an FTS5 query, or None for neither.
+
+    Every word must match the name, the last one as a prefix; words are
+    quoted, so FTS5 operators in user input are taken literally.
+    """
+    words = re.findall(r"\w+", (text or "").lower())
+    terms = [f'"{word}"' for word in words]
+    if words and len(words[-1]) >= 2:
+        terms[-1] += "*"
+    query = [f"organization : ({' '.join(terms)})"] if terms else []
+    if facet is not None:
+        query.append(f"facets : {facet}")
+    return " AND ".join(query) or None
+
+
+def _hashes(keys):
+    """Two 64-bit hashes per key, for double hashing."""
+    digests = b"".join(hashlib.blake2b(key.encode(), digest_size=16).digest() for key in keys)
+    return np.frombuffer(digests, dtype="<u8").reshape(-1, 2)
+
+
+class BloomFilter:
+    """Bit array answering "certainly absent" or "possibly present" for string keys.
+
+    Sized for capacity keys at error_rate; past capacity the false positive
+    rate climbs, so the owner rebuilds it larger.
+    """
+
+    def __init__(self, capacity, error_rate=BLOOM_ERROR_RATE):
+        self.capacity = max(int(capacity), 1024)
+        bits = -self.capacity * np.log(error_rate) / np.log(2) ** 2
+        self.size = int(bits) // 8 * 8 + 8
+        self.hashes = max(1, round(self.size / self.capacity * np.log(2)))
+        self.count = 0
+        self.bits = bytearray(self.size // 8)
+        self.steps = np.arange(self.hashes, dtype=np.uint64)
+
+    def _positions(self, keys):
+        h = _hashes(keys)
+        with np.errstate(over="ignore"):
+            return (h[:, :1] + self.steps * h[:, 1:]) % np.uint64(self.size)
+
+    def update(self, keys):
+        keys = list(keys)
+        if not keys:
+            return
+        bits = np.unpackbits(np.frombuffer(self.bits, dtype=np.uint8), bitorder="little").astype(bool)
+        bits[self._positions(keys).ravel()] = True
+        self.bits = bytearray(np.packbits(bits, bitorder="little").tobytes())
+        self.count += len(keys)
+
+    def __contains__(self, key):
+        h1, h2 = _hashes([key])[0].tolist()
+        bits, size = self.bits, self.size
+        for i in range(self.hashes):
+            p = (h1 + i * h2) % 2**64 % size
+            if not bits[p >> 3] & (1 << (p & 7)):
+                return False
+        return True
+
+
+class Registry:
+    """Public listings of certified organizations, in SQLite.
+
+    Reads use one connection per thread (and process). Certificate
+    verification first asks an in-memory Bloom filter of every issued ID,
+    so an unknown ID is answered without a query. The filter is built on
+    first use (serve.py builds it before forking, so workers share it) and
+    catches up with listings added elsewhere at most every
+    refresh_interval seconds.
+    """
+
+    def __init__(self, path, refresh_interval=5.0):
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.bloom = None
+        self.bloom_max_id = 0
+        self.bloom_checked = 0.0
+
+    def connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None or self.local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA cache_size=-65536")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.create_function("facet_tokens", 3, facet_tokens, deterministic=True)
+            conn.executescript(SCHEMA)
+            self.local.conn, self.local.pid = conn, os.getpid()
+        return conn
+
+    def search(self, q=None, certification=None, level=None, industry=None, before=None, limit=PER_PAGE):
+        """One page of listings, newest first -> (listings, cursor of the next page or None).
+
+        before is the cursor returned for the previous page; the filters
+        are exact matches and q is a name search.
+        """
+        filters = {name: value for name, value in
+                   (("certification", certification), ("level", level), ("industry", industry)) if value}
+        # One filter alone covers a large share of the registry, and FTS5
+        # reads a facet's whole posting list to intersect it. With a name
+        # search, such a filter is checked on the joined row instead: the
+        # name's matches are walked newest first and the page fills quickly
+        checked = filters if len(filters) == 1 and match_query(q) is not None else {}
+        query = match_query(q, None if checked else facet_token(**filters))
+        if query is None:
+            sql = "FROM listings l"
+            params = []
+        else:
+            # Ordered and paged on the FTS5 rowid: FTS5 then yields matches
+            # newest first and stops at the page end
+            sql = "FROM listings_fts f JOIN listings l ON l.id = f.rowid WHERE listings_fts MATCH ?"
+            params = [query]
+            for name, value in checked.items():
+                sql += f" AND l.{name} = ?"
+                params.append(value)
+        key = "l.id" if query is None else "f.rowid"
+        if before is not None:
+            sql += f" {'WHERE' if query is None else 'AND'} {key} < ?"
+            params.append(before)
+        sql = f"SELECT l.id, {', '.join('l.' + name for name in FIELDS)} {sql} ORDER BY {key} DESC LIMIT ?"
+        rows = self.connection().execute(sql, (*params, limit + 1)).fetchall()
+        listings = [self._listing(row[1:]) for row in rows[:limit]]
+        return listings, rows[limit - 1][0] if len(rows) > limit else None
+
+    def get(self, certificate_id):
+        row = self.connection().execute(
+            f"SELECT {', '.join(FIELDS)} FROM listings WHERE certificate_id = ?", (certificate_id,)
+        ).fetchone()
+        return self._listing(row) if row else None
+
+    def verify(self, certificate_id):
+        """The listing of a certificate ID, or None; unknown IDs rarely reach SQLite."""
+        certificate_id = normalize_id(certificate_id)
+        if certificate_id is None or certificate_id not in self.filter():
+            return None
+        return self.get(certificate_id)
+
+    def filter(self):
+        now = time.monotonic()
+        if self.bloom is not None and now - self.bloom_checked < self.refresh_interval:
+            return self.bloom
+        with self.lock:
+            if self.bloom is None:
+                self._build_filter()
+            elif now - self.bloom_checked >= self.refresh_interval:
+                self._catch_up()
+            self.bloom_checked = time.monotonic()
+            return self.bloom
+
+    def _build_filter(self):
+        conn = self.connection()
+        count, max_id = conn.execute("SELECT count(*), coalesce(max(id), 0) FROM listings").fetchone()
+        bloom = BloomFilter(count * 2)
+        bloom.update(row[0] for row in conn.execute("SELECT certificate_id FROM listings WHERE id <= ?", (max_id,)))
+        self.bloom, self.bloom_max_id = bloom, max_id
+
+    def _catch_up(self):
+        rows = self.connection().execute(
+            "SELECT id, certificate_id FROM listings WHERE id > ? ORDER BY id", (self.bloom_max_id,)
+        ).fetchall()
+        if not rows:
+            return
+        if self.bloom.count + len(rows) > self.bloom.capacity:
+            self._build_filter()
+            return
+        self.bloom.update(certificate_id for _, certificate_id in rows)
+        self.bloom_max_id = rows[-1][0]
+
+    def add(self, listings):
+        """Insert listings (dicts of FIELDS) in one transaction; returns how many were new."""
+        conn = self.connection()
+        sql = f"INSERT OR IGNORE INTO listings ({', '.join(FIELDS)}) VALUES ({', '.join('?' * len(FIELDS))})"
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            last_id = conn.execute("SELECT coalesce(max(id), 0) FROM listings").fetchone()[0]
+            added = conn.executemany(sql, ([listing[name] for name in FIELDS] for listing in listings)).rowcount
+            conn.execute(
+                "INSERT INTO listings_fts (rowid, organization, facets) SELECT id, organization, "
+                "facet_tokens(certification, level, industry) FROM listings WHERE id > ?",
+                (last_id,),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        # Seen by this process's filter at once; other processes catch up
+        self.bloom_checked = 0.0
+        return added
+
+    def _listing(self, row):
+        listing = dict(zip(FIELDS, row))
+        listing["valid"] = listing["expires"] >= date.today().isoformat()
+        return listing
+
+
+# Word lists for synthetic listings (`flask registry-seed`)
+_NAME_WORDS = (
+    "Green", "Blue", "River", "Summit", "Harbor", "Evergreen", "Solar", "Terra", "Oak", "Cedar", "Maple", "Lotus",
+    "Horizon", "Pioneer", "Crest", "Valley", "Meadow", "Coastal", "Northern", "Eastern", "Global", "United",
+    "Prime", "Nova", "Sterling", "Bright", "Clear", "Pure", "Vista", "Aurora", "Silver", "Golden", "Urban",
+)
+_NAME_KINDS = (
+    "Foods", "Textiles", "Logistics", "Hotels", "Builders", "Farms", "Packaging", "Motors", "Pharma", "Energy",
+    "Systems", "Retail", "Steel", "Paper", "Chemicals", "Realty", "Exports", "Industries", "Services", "Labs",
+)
+_NAME_SUFFIXES = ("Ltd", "Pvt Ltd", "LLP", "Inc", "Group", "Co", "Holdings", "Enterprises")
+_CITIES = (
+    "Mumbai", "Delhi", "Bengaluru", "Chennai", "Pune", "Hyderabad", "Kolkata", "Ahmedabad", "Jaipur", "Kochi",
+    "Dubai", "Singapore", "London", "Nairobi", "Dhaka", "Colombo",
+)
+
+
+def synthetic_listings(catalog, count, seed=0):
+    """count made-up listings over the catalog's certifications, levels and industries."""
+    rng = random.Random(seed)
+    certs = list(catalog.certifications.values())
+    industries = [industry.name for industry in catalog.industries]
+    prefixes = {cert.slug: "".join(word[0] for word in cert.slug.split("-")).upper() for cert in certs}
+    alphabet = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+    today = date.today()
+    for _ in range(count):
+        cert = rng.choice(certs)
+        issued = today - timedelta(days=rng.randrange(4 * 365))
+        name = f"{rng.choice(_NAME_WORDS)} {rng.choice(_NAME_WORDS)} {rng.choice(_NAME_KINDS)} {rng.choice(_NAME_SUFFIXES)}"
+        yield {
+            "certificate_id": f"{prefixes[cert.slug]}-{issued.year}-{''.join(rng.choices(alphabet, k=8))}",
+            "organization": name,
+            "certification": cert.slug,
+            "level": rng.choice(cert.levels).name if cert.levels else "Certified",
+            "industry": rng.choice(industries),
+            "city": rng.choice(_CITIES),
+            "issued": issued.isoformat(),
+            "expires": (issued + timedelta(days=3 * 365)).isoformat(),
+        }
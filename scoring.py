@@ -0,0 +1,241 @@
+import csv
+import io
+import logging
+import math
+import re
+from operator import itemgetter
+
+import numpy as np
+
+from streams import drain
+
+log = logging.getLogger(__name__)
+
+# Every criteria item is answered on this scale
+SCALE = (
+    (0, "Not started"),
+    (1, "Planned"),
+    (2, "In progress"),
+    (3, "Implemented"),
+    (4, "Verified"),
+)
+SCALE_MAX = SCALE[-1][0]
+# The standardized model's bands, used by certifications whose levels list
+# no score of their own
+DEFAULT_BANDS = {"Bronze": "40 - 54", "Silver": "55 - 69", "Gold": "70 - 84", "Platinum": "85+"}
+BAND = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(?:[-–—]|to)\s*(\d+(?:\.\d+)?)\s*$|^\s*(\d+(?:\.\d+)?)\s*\+\s*$")
+# Rows scored per NumPy batch in bulk mode
+CHUNK_ROWS = 2048
+
+
+def parse_band(text):
+    """ "40 - 54" -> (40.0, 54.0), "85+" -> (85.0, inf); ValueError otherwise."""
+    m = BAND.match(text or "")
+    if m is None:
+        raise ValueError(f"unparsable score band {text!r}")
+    if m.group(3) is not None:
+        return float(m.group(3)), math.inf
+    low, high = float(m.group(1)), float(m.group(2))
+    if high < low:
+        raise ValueError(f"score band {text!r} ends below its start")
+    return low, high
+
+
+class Bands:
+    """Sorted interval index of a certification's level bands.
+
+    A score belongs to the highest band whose lower bound it reaches, so a
+    score between two bands ("54.5" with "40 - 54", "55 - 69") keeps the
+    lower level; below the lowest band there is no level.
+    """
+
+    def __init__(self, levels):
+        bands = sorted(
+            (*parse_band(level.score or DEFAULT_BANDS.get(level.name, "")), level.name) for level in levels
+        )
+        for (_, high, name), (next_low, _, next_name) in zip(bands, bands[1:]):
+            if next_low <= high:
+                raise ValueError(f"score bands of {name} and {next_name} overlap")
+        self.lows = np.array([low for low, _, _ in bands], dtype=np.float64)
+        self.highs = np.array([high for _, high, _ in bands], dtype=np.float64)
+        self.names = [name for _, _, name in bands]
+
+    def level(self, score):
+        i = int(np.searchsorted(self.lows, score, side="right")) - 1
+        return self.names[i] if i >= 0 else None
+
+    def levels(self, scores):
+        """Vectorized level(): an array of band indexes, -1 below the lowest band."""
+        return np.searchsorted(self.lows, scores, side="right") - 1
+
+
+class Scorecard:
+    """The questionnaire of one certification and how answers are scored.
+
+    Questions are the items of each criteria group, identified as
+    "<group>.<item>" counting from 1. Each criteria group weighs the same:
+    a group's score is its mean answer as a percentage of SCALE_MAX, and
+    the overall score is the mean of the group scores. Unanswered items
+    count as 0.
+    """
+
+    def __init__(self, cert):
+        self.cert = cert
+        self.questions = [
+            (f"{g}.{i}", group.title, item)
+            for g, group in enumerate(cert.criteria, 1)
+            for i, item in enumerate(group.items, 1)
+        ]
+        self.ids = [qid for qid, _, _ in self.questions]
+        self.groups = [group.title for group in cert.criteria]
+        # answers (n, items) @ weights (items, groups) -> group scores in percent
+        self.weights = np.zeros((len(self.ids), len(self.groups)), dtype=np.float64)
+        row = 0
+        for g, group in enumerate(cert.criteria):
+            self.weights[row:row + len(group.items), g] = 100.0 / (SCALE_MAX * len(group.items))
+            row += len(group.items)
+        try:
+            self.bands = Bands(cert.levels)
+        except ValueError as exc:
+            log.warning("%s: %s; using the standard bands", cert.slug, exc)
+            self.bands = Bands([_DefaultLevel(name) for name in DEFAULT_BANDS])
+
+    def answers_row(self, answers):
+        """{question id: answer} -> a row of floats; ValueError names bad answers."""
+        unknown = set(answers) - set(self.ids)
+        if unknown:
+            raise ValueError(f"Unknown questions: {', '.join(sorted(unknown))}")
+        row = np.zeros(len(self.ids), dtype=np.float64)
+        for col, qid in enumerate(self.ids):
+            value = answers.get(qid)
+            if value in (None, ""):
+                continue
+            row[col] = _answer(value, qid)
+        return row
+
+    def score_matrix(self, answers):
+        """answers (n, items) -> (overall (n,), group scores (n, groups), band index (n,)).
+
+        Scores are rounded to one decimal before banding, so a reported
+        score and its level always agree.
+        """
+        groups = answers @ self.weights
+        overall = groups.mean(axis=1) if len(self.groups) else np.zeros(len(answers))
+        overall = np.round(overall, 1)
+        return overall, np.round(groups, 1), self.bands.levels(overall)
+
+    def score(self, answers):
+        overall, groups, levels = self.score_matrix(self.answers_row(answers)[None, :])
+        return {
+            "certification": self.cert.slug,
+            "score": float(overall[0]),
+            "level": self.bands.names[levels[0]] if levels[0] >= 0 else None,
+            "groups": [
+                {"title": title, "score": float(s)} for title, s in zip(self.groups, groups[0])
+            ],
+        }
+
+    def template_csv(self):
+        out = io.StringIO()
+        csv.writer(out).writerow(["organization", *self.ids])
+        return out.getvalue()
+
+    def score_csv(self, lines):
+        """Score an uploaded CSV (an iterable of text lines), yielding result CSV chunks.
+
+        The header row names the columns: "organization" plus question ids,
+        in any order; other columns are ignored. Rows with an invalid answer
+        are reported in the error column rather than failing the upload.
+        """
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError("The CSV file is empty")
+        header = [name.strip() for name in header]
+        if "organization" not in header:
+            raise ValueError("The CSV header needs an organization column")
+        org_col = header.index("organization")
+        cols = [(header.index(qid), k) for k, qid in enumerate(self.ids) if qid in header]
+        if not cols:
+            raise ValueError("The CSV header names none of the questions; download the template")
+
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(["organization", "score", "level", *self.groups, "error"])
+        yield drain(out)
+        batch = []
+        for row in reader:
+            if not any(row):
+                continue
+            batch.append(row)
+            if len(batch) == CHUNK_ROWS:
+                self._write_batch(batch, org_col, cols, writer)
+                batch = []
+                yield drain(out)
+        if batch:
+            self._write_batch(batch, org_col, cols, writer)
+            yield drain(out)
+
+    def _write_batch(self, rows, org_col, cols, writer):
+        srcs = [src for src, _ in cols]
+        width = max(srcs + [org_col]) + 1
+        pick = itemgetter(*srcs) if len(srcs) > 1 else lambda row: (row[srcs[0]],)
+        rows = [row if len(row) >= width else row + [""] * (width - len(row)) for row in rows]
+        errors = [""] * len(rows)
+        try:
+            # One pass over the batch; only a batch holding a blank-but-space
+            # or non-number cell falls back to checking row by row
+            values = np.array([[float(cell) if cell else 0.0 for cell in pick(row)] for row in rows])
+        except ValueError:
+            values = np.zeros((len(rows), len(srcs)), dtype=np.float64)
+            for r, row in enumerate(rows):
+                for c, cell in enumerate(pick(row)):
+                    cell = cell.strip()
+                    if cell:
+                        try:
+                            values[r, c] = float(cell)
+                        except ValueError:
+                            errors[r] = f"{self.ids[cols[c][1]]}: {cell!r} is not a number"
+                            break
+        in_range = (values >= 0) & (values <= SCALE_MAX)
+        for r in np.flatnonzero(~in_range.all(axis=1)):
+            if not errors[r]:
+                c = int(np.flatnonzero(~in_range[r])[0])
+                errors[r] = f"{self.ids[cols[c][1]]}: {pick(rows[r])[c].strip()!r} is outside 0-{SCALE_MAX}"
+        answers = np.zeros((len(rows), len(self.ids)), dtype=np.float64)
+        answers[:, [dest for _, dest in cols]] = values
+        overall, groups, levels = self.score_matrix(answers)
+        names = self.bands.names
+        for r, row in enumerate(rows):
+            org = row[org_col]
+            if errors[r]:
+                writer.writerow([org, "", "", *([""] * len(self.groups)), errors[r]])
+            else:
+                level = names[levels[r]] if levels[r] >= 0 else ""
+                writer.writerow([org, overall[r], level, *groups[r].tolist(), ""])
+
+
+class ScoringEngine:
+    """Scorecards of every certification, built once per catalog version."""
+
+    def __init__(self, catalog):
+        self.cards = {slug: Scorecard(cert) for slug, cert in catalog.certifications.items()}
+
+    def get(self, slug):
+        return self.cards.get(slug)
+
+
+class _DefaultLevel:
+    def __init__(self, name):
+        self.name = name
+        self.score = DEFAULT_BANDS[name]
+
+
+def _answer(value, qid):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{qid}: {value!r} is not a number") from None
+    if not 0 <= number <= SCALE_MAX:
+        raise ValueError(f"{qid}: {value!r} is outside 0-{SCALE_MAX}")
+    return number
@@ -0,0 +1,135 @@
+import re
+from bisect import bisect_left
+
+import numpy as np
+
+TOKEN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by can for from has have in is it its of on or that the their "
+    "this to with".split()
+)
+
+# Field weights: a match in the title counts three times a match in an FAQ answer
+FIELD_WEIGHTS = (
+    ("title", 3.0),
+    ("short", 2.0),
+    ("applicable", 1.0),
+    ("suitable_for", 1.5),
+    ("criteria", 1.0),
+    ("benefits", 1.0),
+    ("faq", 1.0),
+)
+
+K1 = 1.2
+B = 0.75
+MAX_PREFIX_EXPANSION = 64
+
+
+def tokenize(text):
+    return [t for t in TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def field_texts(cert):
+    yield "title", cert.title
+    yield "short", cert.short
+    yield "applicable", cert.applicable
+    for item in cert.suitable_for:
+        yield "suitable_for", item
+    for group in cert.criteria:
+        for item in group.items:
+            yield "criteria", item
+    for group in cert.benefits:
+        for item in group.items:
+            yield "benefits", item
+    for faq in cert.faq:
+        yield "faq", faq.q
+        yield "faq", faq.a
+
+
+class SearchIndex:
+    """BM25 inverted index over the catalog with array-backed postings.
+
+    Terms are kept sorted so prefix lookups are a bisect. Postings for term
+    i live in doc_ids/impacts[offsets[i]:offsets[i + 1]], where the impact is
+    the term's precomputed BM25 contribution to that document, so a query
+    is a handful of vectorized gathers and adds over flat arrays.
+    """
+
+    def __init__(self, catalog):
+        weights = dict(FIELD_WEIGHTS)
+        self.docs = list(catalog.certifications.values())
+        postings = {}
+        lengths = []
+        for doc_id, cert in enumerate(self.docs):
+            tf = {}
+            for field, text in field_texts(cert):
+                for term in tokenize(text):
+                    tf[term] = tf.get(term, 0.0) + weights[field]
+            for term, freq in tf.items():
+                postings.setdefault(term, ([], []))
+                postings[term][0].append(doc_id)
+                postings[term][1].append(freq)
+            lengths.append(sum(tf.values()))
+
+        self.terms = sorted(postings)
+        self.df = np.array([len(postings[t][0]) for t in self.terms], dtype=np.uint32)
+        self.offsets = np.zeros(len(self.terms) + 1, dtype=np.uint32)
+        np.cumsum(self.df, out=self.offsets[1:])
+        self.doc_ids = np.fromiter(
+            (d for t in self.terms for d in postings[t][0]), dtype=np.uint32, count=int(self.offsets[-1])
+        )
+        freqs = np.fromiter(
+            (f for t in self.terms for f in postings[t][1]), dtype=np.float32, count=int(self.offsets[-1])
+        )
+
+        n = len(self.docs)
+        lengths = np.array(lengths, dtype=np.float32)
+        avg_len = lengths.mean() if n else 1.0
+        idf = np.log1p((n - self.df + 0.5) / (self.df + 0.5)).astype(np.float32)
+        norm = K1 * (1 - B + B * lengths[self.doc_ids] / avg_len)
+        self.impacts = np.repeat(idf, self.df) * freqs * (K1 + 1) / (freqs + norm)
+
+    def _term_ids(self, term, prefix):
+        i = bisect_left(self.terms, term)
+        if not prefix:
+            return [i] if i < len(self.terms) and self.terms[i] == term else []
+        ids = []
+        while i < len(self.terms) and self.terms[i].startswith(term) and len(ids) < MAX_PREFIX_EXPANSION:
+            ids.append(i)
+            i += 1
+        return ids
+
+    def search(self, query, limit=10, prefix=True):
+        """Return [(score, cert)] best first; the last query term matches as a prefix."""
+        tokens = tokenize(query)
+        if not tokens or not self.docs:
+            return []
+        scores = np.zeros(len(self.docs), dtype=np.float32)
+        for pos, token in enumerate(tokens):
+            term_ids = self._term_ids(token, prefix and pos == len(tokens) - 1)
+            if len(term_ids) == 1:
+                start, end = self.offsets[term_ids[0]], self.offsets[term_ids[0] + 1]
+                scores[self.doc_ids[start:end]] += self.impacts[start:end]
+            elif term_ids:
+                # A prefix counts once per document, with its best-scoring completion
+                best = np.zeros_like(scores)
+                for term_id in term_ids:
+                    start, end = self.offsets[term_id], self.offsets[term_id + 1]
+                    ids = self.doc_ids[start:end]
+                    best[ids] = np.maximum(best[ids], self.impacts[start:end])
+                scores += best
+        hits = np.flatnonzero(scores)
+        if len(hits) > limit:
+            hits = hits[np.argpartition(-scores[hits], limit - 1)[:limit]]
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        return [(float(scores[i]), self.docs[i]) for i in hits]
+
+    def suggest(self, prefix, limit=8):
+        """Complete a partial word into indexed terms, most common first."""
+        tokens = tokenize(prefix)
+        if not tokens or not prefix[-1:].isalnum():
+            return []
+        ids = self._term_ids(tokens[-1], True)
+        ids.sort(key=lambda i: -int(self.df[i]))
+        return [self.terms[i] for i in ids[:limit]]
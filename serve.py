@@ -0,0 +1,376 @@
+"""Production launcher: python serve.py
+
+Imports the app, loads the catalog and compiles the templates (through
+the on-disk bytecode cache) once in the master, then forks SERVE_WORKERS
+workers that share the listening socket and the preloaded heap
+copy-on-write. Each worker serves requests on a pool of SERVE_THREADS
+threads and exits on its own after SERVE_MAX_REQUESTS requests or once it
+grows past SERVE_MAX_RSS_MB; the master replaces it.
+
+Signals to the master:
+  HUP         reload the catalog, fork a fresh set of workers, then retire
+              the old ones gracefully; the socket never closes, so no
+              connection is dropped
+  TERM, INT   stop accepting, let in-flight requests finish, exit
+  TTIN, TTOU  one worker more / fewer
+
+The master also watches the catalog files and rolls the workers the same
+way when they change. Before each roll it renders the new catalog's
+missing brochures, so no worker waits on one; cache purges (PURGE_URL) are
+sent from the master once the last worker of the old catalog has exited.
+
+Settings are read from app.config, i.e. FLASK_SERVE_BIND, FLASK_SERVE_WORKERS
+and so on in the environment.
+"""
+import gc
+import logging
+import os
+import random
+import select
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+log = logging.getLogger("serve")
+
+
+def parse_bind(bind):
+    """'host:port', ':port' or 'unix:/path' -> (family, address)."""
+    if bind.startswith("unix:"):
+        return socket.AF_UNIX, bind[5:]
+    host, _, port = bind.rpartition(":")
+    host = host.strip("[]") or "0.0.0.0"
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    return family, (host, int(port))
+
+
+def listen(bind, backlog=2048):
+    family, address = parse_bind(bind)
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    if family == socket.AF_UNIX:
+        if os.path.exists(address):
+            os.unlink(address)
+    else:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # Headers and body go out in separate writes; without this the
+        # body's last segment waits on the client's delayed ACK
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.bind(address)
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class RequestHandler(WSGIRequestHandler):
+    # One request per connection: an idle keep-alive client would otherwise
+    # hold one of the few pool threads. Keep-alive belongs in the proxy.
+    protocol_version = "HTTP/1.0"
+    access_log = False
+    early_hints = False
+
+    def log_request(self, code="-", size="-"):
+        if self.access_log:
+            super().log_request(code, size)
+
+    def make_environ(self):
+        environ = super().make_environ()
+        if self.early_hints:
+            environ["wsgi.early_hints"] = self.send_early_hints
+        return environ
+
+    def send_early_hints(self, headers):
+        """Write a 103 response ahead of the real one; HTTP/1.0 clients get none."""
+        if self.request_version != "HTTP/1.1":
+            return
+        lines = ["HTTP/1.1 103 Early Hints"] + [f"{name}: {value}" for name, value in headers]
+        self.wfile.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        self.wfile.flush()
+
+
+class PoolServer(BaseWSGIServer):
+    """Werkzeug's server on an inherited socket with a bounded thread pool.
+
+    The accept loop blocks while every thread is busy, leaving new
+    connections in the kernel backlog where an idle sibling worker can
+    take them instead of queueing them behind this one.
+    """
+
+    multithread = True
+    multiprocess = True
+
+    def __init__(self, app, sock, threads, on_request=None, handler=RequestHandler):
+        if sock.family == socket.AF_UNIX:
+            host, port = "unix://" + sock.getsockname(), 0
+        else:
+            host, port = sock.getsockname()[:2]
+        super().__init__(host, port, app, handler=handler, fd=sock.fileno())
+        # Every worker wakes for each connection; the losers of the accept()
+        # race must return to the loop instead of blocking in it
+        self.socket.setblocking(False)
+        self.slots = threading.BoundedSemaphore(threads)
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="request")
+        self.on_request = on_request
+
+    def process_request(self, request, client_address):
+        self.slots.acquire()
+        self.pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self.slots.release()
+            if self.on_request is not None:
+                self.on_request()
+
+    def drain(self):
+        self.pool.shutdown(wait=True)
+
+
+class Worker:
+    def __init__(self, app, sock, threads, max_requests, max_rss_mb, forked_at):
+        self.app = app
+        self.forked_at = forked_at
+        self.sock = sock
+        self.threads = threads
+        self.max_requests = max_requests
+        self.max_rss_mb = max_rss_mb
+        self.handled = 0
+        self.lock = threading.Lock()
+        self.stopping = False
+        self.server = None
+
+    def run(self):
+        for sig in (signal.SIGHUP, signal.SIGTTIN, signal.SIGTTOU):
+            signal.signal(sig, signal.SIG_IGN)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, lambda *_: self.stop("shutdown"))
+        signal.set_wakeup_fd(-1)
+        self.server = PoolServer(self.app, self.sock, self.threads, on_request=self.request_done)
+        log.info("worker %d ready in %.1f ms", os.getpid(), (time.perf_counter() - self.forked_at) * 1000)
+        self.server.serve_forever(poll_interval=0.5)
+        self.server.drain()
+
+    def request_done(self):
+        with self.lock:
+            self.handled += 1
+            handled = self.handled
+        if self.max_requests and handled >= self.max_requests:
+            self.stop(f"recycling after {handled} requests")
+        elif self.max_rss_mb and handled % 50 == 0 and rss_mb() > self.max_rss_mb:
+            self.stop(f"recycling at {rss_mb():.0f} MB")
+
+    def stop(self, reason):
+        with self.lock:
+            if self.stopping:
+                return
+            self.stopping = True
+        log.info("worker %d: %s", os.getpid(), reason)
+        # shutdown() waits for serve_forever, which may be running in this thread
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+
+class Master:
+    def __init__(self, app, sock, workers, threads, max_requests=0, max_rss_mb=0, graceful_timeout=30,
+                 on_reload=None, on_worker_exit=None, check_reload=None, before_roll=None, on_rolled=None):
+        self.app = app
+        self.sock = sock
+        self.size = workers
+        self.threads = threads
+        self.max_requests = max_requests
+        self.max_rss_mb = max_rss_mb
+        self.graceful_timeout = graceful_timeout
+        self.on_reload = on_reload
+        self.on_worker_exit = on_worker_exit
+        self.check_reload = check_reload
+        self.before_roll = before_roll
+        self.on_rolled = on_rolled
+        self.rolling = set()  # pids of replaced generations still running
+        self.workers = {}  # pid -> generation
+        self.retiring = {}  # pid -> kill deadline
+        self.generation = 0
+        self.signals = []
+        self.stopping = False
+
+    def spawn(self):
+        # Stagger recycling so the workers don't all restart at once
+        max_requests = self.max_requests
+        if max_requests:
+            max_requests += random.randint(0, max_requests // 10)
+        forked_at = time.perf_counter()
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = self.generation
+            return pid
+        code = 0
+        try:
+            Worker(self.app, self.sock, self.threads, max_requests, self.max_rss_mb, forked_at).run()
+            # os._exit skips atexit, so anything buffered is flushed here
+            if self.on_worker_exit is not None:
+                self.on_worker_exit()
+        except BaseException:
+            log.exception("worker %d crashed", os.getpid())
+            code = 1
+        finally:
+            logging.shutdown()
+            os._exit(code)
+
+    def retire(self, pid):
+        self.workers.pop(pid, None)
+        self.retiring[pid] = time.monotonic() + self.graceful_timeout
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def run(self):
+        wake_r, wake_w = os.pipe()
+        os.set_blocking(wake_w, False)
+        signal.set_wakeup_fd(wake_w)
+        for sig in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT, signal.SIGTTIN, signal.SIGTTOU, signal.SIGCHLD):
+            signal.signal(sig, lambda signum, frame: self.signals.append(signum))
+        # Objects loaded so far are never freed; keeping the collector off
+        # them stops workers from dirtying (and so copying) their pages
+        gc.freeze()
+        log.info("master %d listening on %s with %d workers x %d threads",
+                 os.getpid(), self.sock.getsockname(), self.size, self.threads)
+        for _ in range(self.size):
+            self.spawn()
+
+        while self.workers or self.retiring:
+            try:
+                # Only read when select says so: a timeout must not leave the
+                # loop blocked on the pipe until the next signal
+                if select.select([wake_r], [], [], 1.0)[0]:
+                    os.read(wake_r, 512)
+            except (BlockingIOError, InterruptedError):
+                pass
+            while self.signals:
+                self.handle(self.signals.pop(0))
+            if self.check_reload is not None and not self.stopping and self.check_reload():
+                log.info("catalog changed, rolling workers")
+                self.roll()
+            self.reap()
+            if self.rolling and not self.rolling & (self.workers.keys() | self.retiring.keys()):
+                self.rolling = set()
+                if self.on_rolled is not None:
+                    self.on_rolled()
+            now = time.monotonic()
+            for pid, deadline in list(self.retiring.items()):
+                if now > deadline:
+                    log.warning("worker %d did not stop in time, killing it", pid)
+                    try:
+                        os.kill(pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+                    self.retiring[pid] = float("inf")
+            if not self.stopping:
+                while len(self.workers) < self.size:
+                    self.spawn()
+        log.info("master %d stopped", os.getpid())
+
+    def handle(self, signum):
+        if signum in (signal.SIGTERM, signal.SIGINT):
+            if not self.stopping:
+                log.info("stopping gracefully")
+                self.stopping = True
+                for pid in list(self.workers):
+                    self.retire(pid)
+        elif signum == signal.SIGHUP and not self.stopping:
+            log.info("reloading")
+            if self.on_reload is not None:
+                self.on_reload()
+            self.roll()
+        elif signum == signal.SIGTTIN:
+            self.size += 1
+        elif signum == signal.SIGTTOU and self.size > 1:
+            self.size -= 1
+            pid = min(self.workers, key=self.workers.get)
+            self.retire(pid)
+
+    def roll(self):
+        """Replace every worker with one forked from the master's current state."""
+        if self.before_roll is not None:
+            self.before_roll()
+        gc.freeze()
+        old = list(self.workers)
+        self.rolling.update(old)
+        self.generation += 1
+        for _ in range(self.size):
+            self.spawn()
+        for pid in old:
+            self.retire(pid)
+
+    def reap(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if pid in self.workers:
+                del self.workers[pid]
+                code = os.waitstatus_to_exitcode(status)
+                if code != 0:
+                    log.warning("worker %d exited with %d", pid, code)
+            self.retiring.pop(pid, None)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="[%(process)d] %(levelname)s %(name)s: %(message)s")
+    # Preload: the catalog, indexes and templates are built here, once
+    started = time.perf_counter()
+    import app as application
+
+    imported = (time.perf_counter() - started) * 1000
+    application.warm_up()
+    boot = application.boot_times
+    log.info(
+        "booted in %.0f ms: imports %.0f, catalog %.0f, app setup %.0f, templates %.0f, registry %.0f, "
+        "brochures %.0f",
+        imported + boot["templates"] + boot["registry"] + boot["brochures"], imported - boot["app"],
+        boot["catalog"], boot["app"] - boot["catalog"], boot["templates"], boot["registry"], boot["brochures"],
+    )
+    app, config = application.app, application.app.config
+    RequestHandler.access_log = config["SERVE_ACCESS_LOG"]
+    RequestHandler.early_hints = config["SERVE_EARLY_HINTS"]
+    sock = listen(config["SERVE_BIND"], config["SERVE_BACKLOG"])
+    purger = application.purger
+    if purger is not None:
+        purger.deferred = True
+
+    Master(
+        app, sock,
+        workers=config["SERVE_WORKERS"] or os.cpu_count() or 1,
+        threads=config["SERVE_THREADS"],
+        max_requests=config["SERVE_MAX_REQUESTS"],
+        max_rss_mb=config["SERVE_MAX_RSS_MB"],
+        graceful_timeout=config["SERVE_GRACEFUL_TIMEOUT"],
+        on_reload=application.catalog_store.reload,
+        on_worker_exit=application.close,
+        check_reload=application.catalog_store.maybe_reload,
+        before_roll=lambda: application.brochure_store.build_all(application.catalog_store.current),
+        on_rolled=purger.flush if purger is not None else None,
+    ).run()
+
+
+if __name__ == "__main__":
+    main()
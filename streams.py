@@ -0,0 +1,10 @@
+def drain(buf):
+    """Empty a StringIO and return what was in it: one chunk of a streamed response.
+
+    A generator keeps writing to the same buffer (csv.writer needs a file)
+    and yields each batch, so the buffer never holds more than one batch.
+    """
+    text = buf.getvalue()
+    buf.seek(0)
+    buf.truncate()
+    return text